@@ -11,6 +11,23 @@ TreeNode
 BinarySearchTree
     A class to represent the BST and provide methods to manipulate it.
 
+AVLTreeNode
+    A class to represent a node in the AVL tree, tracking its height.
+
+AVLTree
+    A self-balancing BST that keeps its depth at O(log n).
+
+ArrayBinarySearchTree
+    A compact BST that stores its nodes in parallel arrays.
+
+Functions:
+----------
+benchmark_sorted_inserts(num_keys)
+    Measure the depth and per-operation latency of an AVLTree fed sorted keys.
+
+benchmark_memory(num_keys)
+    Compare the memory cost per key of the tree backends.
+
 Example usage:
 --------------
 bst = BinarySearchTree()
@@ -19,8 +36,27 @@ bst.insert(5)
 bst.insert(15)
 node = bst.search(10)
 print(node)
+print(list(bst))
+
+index = AVLTree.from_sorted(range(0, 100, 10))
+print(list(index.range(20, 50)), index.floor(35), index.rank(35), index.select(3))
+
+index.save('index.bst')
+with BinarySearchTree.open('index.bst') as shared:
+    print(shared.search(30) is not None, list(shared.range(20, 50)))
+
+avl = AVLTree()
+for key in range(1000):
+    avl.insert(key)
+print(avl.height())
 """
 
+import mmap
+import struct
+import time
+import tracemalloc
+from array import array
+
 
 class TreeNode:
     """
@@ -34,8 +70,12 @@ class TreeNode:
         The left child of the node.
     right : TreeNode or None
         The right child of the node.
+    size : int
+        The number of nodes in the subtree rooted at this node.
     """
 
+    __slots__ = ('key', 'left', 'right', 'size')
+
     def __init__(self, key):
         """
         Initialize the TreeNode with a key.
@@ -48,6 +88,7 @@ class TreeNode:
         self.key = key
         self.left = None
         self.right = None
+        self.size = 1
 
     def __str__(self):
         """
@@ -77,30 +118,183 @@ class BinarySearchTree:
         """
         self.root = None
 
-    def _insert(self, node, key):
+    @classmethod
+    def from_sorted(cls, iterable):
+        """
+        Build a perfectly balanced tree from keys in ascending order in O(n).
+
+        Duplicate keys are kept once, as with insert.
+
+        Parameters:
+        -----------
+        iterable : iterable of int
+            The keys in ascending order.
+
+        Returns:
+        --------
+        BinarySearchTree
+            A new tree holding the keys.
+
+        Raises:
+        -------
+        ValueError
+            If the keys are not in ascending order.
+        """
+        keys = []
+        for key in iterable:
+            if keys and key <= keys[-1]:
+                if key == keys[-1]:
+                    continue
+                raise ValueError('keys must be in ascending order')
+            keys.append(key)
+
+        tree = cls()
+
+        def build(low, high):
+            if low >= high:
+                return None
+            middle = (low + high) // 2
+            node = tree._new_node(keys[middle])
+            tree._attach_children(node, build(low, middle), build(middle + 1, high))
+            return node
+
+        tree.root = build(0, len(keys))
+        return tree
+
+    def save(self, path, typecode='q'):
+        """
+        Write the tree to a file that can be memory-mapped with open.
+
+        Parameters:
+        -----------
+        path : str or os.PathLike
+            The file to write.
+        typecode : str
+            The array.array typecode used to store the keys.
+        """
+        ArrayBinarySearchTree.from_sorted(self, typecode).save(path)
+
+    @staticmethod
+    def open(path):
         """
-        Recursively insert a key into the BST.
+        Map a file written by save as a read-only tree.
+
+        Parameters:
+        -----------
+        path : str or os.PathLike
+            The file to open.
+
+        Returns:
+        --------
+        ArrayBinarySearchTree
+            A read-only tree that queries the mapped file directly.
+        """
+        return ArrayBinarySearchTree.open(path)
+
+    @staticmethod
+    def _size(node):
+        """
+        Return the size of a subtree, treating None as empty.
 
         Parameters:
         -----------
         node : TreeNode or None
-            The current node in the BST.
+            The root of the subtree.
+
+        Returns:
+        --------
+        int
+            The number of nodes in the subtree.
+        """
+        return node.size if node is not None else 0
+
+    def _attach_children(self, node, left, right):
+        """
+        Set both children of a node and recompute its subtree bookkeeping.
+
+        Parameters:
+        -----------
+        node : TreeNode
+            The parent node.
+        left : TreeNode or None
+            The new left child.
+        right : TreeNode or None
+            The new right child.
+        """
+        node.left = left
+        node.right = right
+        node.size = 1 + self._size(left) + self._size(right)
+
+    def _new_node(self, key):
+        """
+        Create a node for a newly inserted key.
+
+        Parameters:
+        -----------
         key : int
-            The value to insert.
+            The value of the node.
 
         Returns:
         --------
         TreeNode
-            The node after insertion.
+            The new node.
         """
-        if node is None:
-            return TreeNode(key)
+        return TreeNode(key)
 
-        if key < node.key:
-            node.left = self._insert(node.left, key)
-        elif key > node.key:
-            node.right = self._insert(node.right, key)
-        return node
+    def _find_path(self, key):
+        """
+        Walk down from the root towards a key.
+
+        Parameters:
+        -----------
+        key : int
+            The value to look for.
+
+        Returns:
+        --------
+        tuple of (list of TreeNode, TreeNode or None)
+            The ancestors visited on the way down (root first), and the node
+            holding the key, or None if the key is not in the BST. When the
+            key is missing, the last ancestor is the parent it would attach to.
+        """
+        path = []
+        node = self.root
+        while node is not None and node.key != key:
+            path.append(node)
+            node = node.left if key < node.key else node.right
+        return path, node
+
+    def _replace_child(self, parent, old, new):
+        """
+        Replace the child old of parent with new, updating the root if needed.
+
+        Parameters:
+        -----------
+        parent : TreeNode or None
+            The parent of old, or None if old is the root.
+        old : TreeNode or None
+            The child to replace.
+        new : TreeNode or None
+            The replacement child.
+        """
+        if parent is None:
+            self.root = new
+        elif parent.left is old:
+            parent.left = new
+        else:
+            parent.right = new
+
+    def _retrace(self, path):
+        """
+        Hook called after a structural change with the ancestors of the change.
+
+        The plain BST does no bookkeeping; subclasses use it to rebalance.
+
+        Parameters:
+        -----------
+        path : list of TreeNode
+            The ancestors of the changed position, root first.
+        """
 
     def insert(self, key):
         """
@@ -111,16 +305,27 @@ class BinarySearchTree:
         key : int
             The value to insert.
         """
-        self.root = self._insert(self.root, key)
+        path, node = self._find_path(key)
+        if node is not None:
+            return
+
+        for ancestor in path:
+            ancestor.size += 1
+        node = self._new_node(key)
+        if not path:
+            self.root = node
+        elif key < path[-1].key:
+            path[-1].left = node
+        else:
+            path[-1].right = node
+        self._retrace(path)
 
-    def _search(self, node, key):
+    def search(self, key):
         """
-        Recursively search for a key in the BST.
+        Search for a key in the BST.
 
         Parameters:
         -----------
-        node : TreeNode or None
-            The current node in the BST.
         key : int
             The value to search for.
 
@@ -129,120 +334,1130 @@ class BinarySearchTree:
         TreeNode or None
             The node with the specified key, or None if not found.
         """
-        if node is None or node.key == key:
-            return node
-        if key < node.key:
-            return self._search(node.left, key)
-        return self._search(node.right, key)
+        node = self.root
+        while node is not None and node.key != key:
+            node = node.left if key < node.key else node.right
+        return node
 
-    def search(self, key):
+    def delete(self, key):
         """
-        Search for a key in the BST.
+        Delete a key from the BST.
 
         Parameters:
         -----------
         key : int
-            The value to search for.
+            The value to delete.
+        """
+        path, node = self._find_path(key)
+        if node is None:
+            return
+
+        if node.left is not None and node.right is not None:
+            path.append(node)
+            successor = node.right
+            while successor.left is not None:
+                path.append(successor)
+                successor = successor.left
+            node.key = successor.key
+            node = successor
+
+        for ancestor in path:
+            ancestor.size -= 1
+        child = node.left if node.left is not None else node.right
+        self._replace_child(path[-1] if path else None, node, child)
+        self._retrace(path)
+
+    def __len__(self):
+        """
+        Return the number of keys in the BST.
 
         Returns:
         --------
-        TreeNode or None
-            The node with the specified key, or None if not found.
+        int
+            The number of keys.
         """
-        return self._search(self.root, key)
+        return self._size(self.root)
 
-    def _delete(self, node, key):
+    def __contains__(self, key):
         """
-        Recursively delete a key from the BST.
+        Check whether a key is in the BST.
 
         Parameters:
         -----------
-        node : TreeNode or None
-            The current node in the BST.
         key : int
-            The value to delete.
+            The value to look for.
 
         Returns:
         --------
-        TreeNode or None
-            The node after deletion.
+        bool
+            True if the key is present, False otherwise.
         """
-        if node is None:
-            return node
+        return self.search(key) is not None
 
-        if key < node.key:
-            node.left = self._delete(node.left, key)
-        elif key > node.key:
-            node.right = self._delete(node.right, key)
-        else:
-            if node.left is None:
-                return node.right
-            elif node.right is None:
-                return node.left
+    def __iter__(self):
+        """
+        Lazily yield the keys of the BST in order.
+
+        Uses an explicit stack bounded by the tree height instead of recursion.
+
+        Yields:
+        -------
+        int
+            The next key in in-order.
+        """
+        stack = []
+        node = self.root
+        while stack or node is not None:
+            while node is not None:
+                stack.append(node)
+                node = node.left
+            node = stack.pop()
+            yield node.key
+            node = node.right
+
+    def inorder_traversal(self):
+        """
+        Perform in-order traversal of the BST.
+
+        Returns:
+        --------
+        list of int
+            The list of node values in in-order.
+        """
+        return list(self)
+
+    def range(self, low, high):
+        """
+        Lazily yield the keys k with low <= k < high in order.
+
+        Subtrees entirely outside the range are never visited.
+
+        Parameters:
+        -----------
+        low : int
+            The inclusive lower bound.
+        high : int
+            The exclusive upper bound.
+
+        Yields:
+        -------
+        int
+            The next key in the range.
+        """
+        stack = []
+        node = self.root
+        while stack or node is not None:
+            while node is not None:
+                if node.key < low:
+                    node = node.right
+                else:
+                    stack.append(node)
+                    node = node.left
+            if not stack:
+                return
+            node = stack.pop()
+            if node.key >= high:
+                return
+            yield node.key
+            node = node.right
+
+    def floor(self, key):
+        """
+        Find the largest key less than or equal to key.
+
+        Parameters:
+        -----------
+        key : int
+            The value to look up.
+
+        Returns:
+        --------
+        int or None
+            The floor of key, or None if every key is greater.
+        """
+        result = None
+        node = self.root
+        while node is not None:
+            if node.key == key:
+                return key
+            if node.key < key:
+                result = node.key
+                node = node.right
+            else:
+                node = node.left
+        return result
+
+    def ceiling(self, key):
+        """
+        Find the smallest key greater than or equal to key.
+
+        Parameters:
+        -----------
+        key : int
+            The value to look up.
+
+        Returns:
+        --------
+        int or None
+            The ceiling of key, or None if every key is smaller.
+        """
+        result = None
+        node = self.root
+        while node is not None:
+            if node.key == key:
+                return key
+            if node.key > key:
+                result = node.key
+                node = node.left
+            else:
+                node = node.right
+        return result
+
+    def rank(self, key):
+        """
+        Count the keys strictly less than key.
+
+        Parameters:
+        -----------
+        key : int
+            The value to rank.
+
+        Returns:
+        --------
+        int
+            The number of keys smaller than key.
+        """
+        rank = 0
+        node = self.root
+        while node is not None:
+            if key <= node.key:
+                node = node.left
+            else:
+                rank += self._size(node.left) + 1
+                node = node.right
+        return rank
+
+    def select(self, index):
+        """
+        Return the key with the given zero-based position in sorted order.
+
+        Parameters:
+        -----------
+        index : int
+            The position of the key, so that select(rank(k)) == k.
+
+        Returns:
+        --------
+        int
+            The key at that position.
+
+        Raises:
+        -------
+        IndexError
+            If index is outside 0 <= index < len(tree).
+        """
+        if not 0 <= index < len(self):
+            raise IndexError('select index out of range')
+        node = self.root
+        while True:
+            left_size = self._size(node.left)
+            if index < left_size:
+                node = node.left
+            elif index == left_size:
+                return node.key
+            else:
+                index -= left_size + 1
+                node = node.right
+
+
+class AVLTreeNode(TreeNode):
+    """
+    A class to represent a node in the AVL tree.
+
+    Attributes:
+    -----------
+    height : int
+        The height of the subtree rooted at this node (a leaf has height 1).
+    """
+
+    __slots__ = ('height',)
 
-            node.key = self._min_value(node.right)
-            node.right = self._delete(node.right, node.key)
+    def __init__(self, key):
+        """
+        Initialize the AVLTreeNode with a key.
+
+        Parameters:
+        -----------
+        key : int
+            The value of the node.
+        """
+        super().__init__(key)
+        self.height = 1
+
+
+class AVLTree(BinarySearchTree):
+    """
+    A self-balancing Binary Search Tree (AVL tree).
+
+    The heights of the two child subtrees of every node differ by at most one,
+    so inserting keys in sorted order no longer degrades the tree into a
+    linked list. It exposes the same insert/search/delete/inorder_traversal
+    API as BinarySearchTree.
+    """
+
+    @staticmethod
+    def _height(node):
+        """
+        Return the height of a node, treating None as an empty subtree.
+
+        Parameters:
+        -----------
+        node : AVLTreeNode or None
+            The node to measure.
+
+        Returns:
+        --------
+        int
+            The height of the node, or 0 if the node is None.
+        """
+        return node.height if node is not None else 0
+
+    def _update_height(self, node):
+        """
+        Recompute the height of a node from its children.
+
+        Parameters:
+        -----------
+        node : AVLTreeNode
+            The node to update.
+        """
+        node.height = 1 + max(self._height(node.left), self._height(node.right))
+
+    def _balance_factor(self, node):
+        """
+        Return the difference between the left and right subtree heights.
+
+        Parameters:
+        -----------
+        node : AVLTreeNode
+            The node to inspect.
+
+        Returns:
+        --------
+        int
+            A positive value if the node is left-heavy, negative if right-heavy.
+        """
+        return self._height(node.left) - self._height(node.right)
+
+    def _rotate_left(self, node):
+        """
+        Rotate the subtree rooted at node to the left.
+
+        Parameters:
+        -----------
+        node : AVLTreeNode
+            The root of the subtree to rotate.
+
+        Returns:
+        --------
+        AVLTreeNode
+            The new root of the subtree.
+        """
+        pivot = node.right
+        node.right = pivot.left
+        pivot.left = node
+        pivot.size = node.size
+        node.size = 1 + self._size(node.left) + self._size(node.right)
+        self._update_height(node)
+        self._update_height(pivot)
+        return pivot
+
+    def _rotate_right(self, node):
+        """
+        Rotate the subtree rooted at node to the right.
+
+        Parameters:
+        -----------
+        node : AVLTreeNode
+            The root of the subtree to rotate.
+
+        Returns:
+        --------
+        AVLTreeNode
+            The new root of the subtree.
+        """
+        pivot = node.left
+        node.left = pivot.right
+        pivot.right = node
+        pivot.size = node.size
+        node.size = 1 + self._size(node.left) + self._size(node.right)
+        self._update_height(node)
+        self._update_height(pivot)
+        return pivot
+
+    def _rebalance(self, node):
+        """
+        Restore the AVL invariant at node after one of its subtrees changed.
+
+        Parameters:
+        -----------
+        node : AVLTreeNode
+            The root of the subtree to rebalance.
 
+        Returns:
+        --------
+        AVLTreeNode
+            The new root of the subtree.
+        """
+        self._update_height(node)
+        balance = self._balance_factor(node)
+        if balance > 1:
+            if self._balance_factor(node.left) < 0:
+                node.left = self._rotate_left(node.left)
+            return self._rotate_right(node)
+        if balance < -1:
+            if self._balance_factor(node.right) > 0:
+                node.right = self._rotate_right(node.right)
+            return self._rotate_left(node)
         return node
 
-    def delete(self, key):
+    def _new_node(self, key):
         """
-        Delete a key from the BST.
+        Create an AVL node for a newly inserted key.
 
         Parameters:
         -----------
         key : int
-            The value to delete.
+            The value of the node.
+
+        Returns:
+        --------
+        AVLTreeNode
+            The new node.
         """
-        self.root = self._delete(self.root, key)
+        return AVLTreeNode(key)
 
-    def _min_value(self, node):
+    def _attach_children(self, node, left, right):
         """
-        Find the node with the minimum value in the BST.
+        Set both children of a node and recompute its size and height.
 
         Parameters:
         -----------
-        node : TreeNode
-            The current node in the BST.
+        node : AVLTreeNode
+            The parent node.
+        left : AVLTreeNode or None
+            The new left child.
+        right : AVLTreeNode or None
+            The new right child.
+        """
+        super()._attach_children(node, left, right)
+        self._update_height(node)
+
+    def _retrace(self, path):
+        """
+        Rebalance the ancestors of an insertion or deletion, bottom-up.
+
+        Stops as soon as a subtree keeps its height without rotating, since
+        nothing above it can have changed.
+
+        Parameters:
+        -----------
+        path : list of AVLTreeNode
+            The ancestors of the changed position, root first.
+        """
+        for depth in range(len(path) - 1, -1, -1):
+            node = path[depth]
+            old_height = node.height
+            subtree = self._rebalance(node)
+            if subtree is not node:
+                self._replace_child(path[depth - 1] if depth else None, node, subtree)
+            elif node.height == old_height:
+                break
+
+    def height(self):
+        """
+        Return the height of the tree.
 
         Returns:
         --------
         int
-            The minimum value in the BST.
+            The number of nodes on the longest root-to-leaf path.
         """
-        while node.left is not None:
-            node = node.left
-        return node.key
+        return self._height(self.root)
+
+
+class ArrayBinarySearchTree:
+    """
+    A Binary Search Tree stored as parallel arrays instead of node objects.
+
+    Node i holds keys[i], its children left[i] and right[i] (NIL when
+    absent) and the size of its subtree sizes[i]. Keys are stored unboxed in
+    an array.array, so the tree costs a few dozen bytes per key instead of a
+    Python object per node. Slots freed by delete are reused by insert. The
+    tree does not rebalance on insert; use from_sorted to build a balanced one.
+
+    search returns the slot index of a key instead of a TreeNode; the rest of
+    the API matches BinarySearchTree.
+
+    Attributes:
+    -----------
+    keys : array.array
+        The key stored in each slot.
+    left : array.array
+        The slot index of each node's left child, or NIL.
+    right : array.array
+        The slot index of each node's right child, or NIL.
+    sizes : array.array
+        The number of nodes in the subtree rooted at each slot.
+    root : int
+        The slot index of the root, or NIL if the tree is empty.
+    typecode : str
+        The array.array typecode of the keys.
+
+    save writes the arrays to a flat file and open maps such a file back as
+    a read-only tree whose arrays are memoryviews over the mapping.
+    """
+
+    NIL = -1
+    MAGIC = b'BST1'
+    TYPECODES = 'bBhHiIlLqQfd'
+    HEADER = struct.Struct('=4sc3xqq')
 
-    def _inorder_traversal(self, node, result):
+    def __init__(self, typecode='q'):
         """
-        Recursively perform in-order traversal of the BST.
+        Initialize an empty ArrayBinarySearchTree.
 
         Parameters:
         -----------
-        node : TreeNode or None
-            The current node in the BST.
-        result : list of int
-            The list to store the traversal result.
+        typecode : str
+            The array.array typecode of the keys, 'q' (64-bit signed
+            integers) by default or 'd' for floats.
+        """
+        self.keys = array(typecode)
+        self.left = array('q')
+        self.right = array('q')
+        self.sizes = array('q')
+        self.root = self.NIL
+        self.typecode = typecode
+        self._free = []
+        self._mmap = None
+
+    @classmethod
+    def from_sorted(cls, iterable, typecode='q'):
+        """
+        Build a perfectly balanced tree from keys in ascending order in O(n).
+
+        The keys array ends up in sorted order, with the node for keys[i]
+        stored in slot i. Duplicate keys are kept once, as with insert.
+
+        Parameters:
+        -----------
+        iterable : iterable of int
+            The keys in ascending order.
+        typecode : str
+            The array.array typecode of the keys.
+
+        Returns:
+        --------
+        ArrayBinarySearchTree
+            A new tree holding the keys.
+
+        Raises:
+        -------
+        ValueError
+            If the keys are not in ascending order.
         """
-        if node:
-            self._inorder_traversal(node.left, result)
-            result.append(node.key)
-            self._inorder_traversal(node.right, result)
+        tree = cls(typecode)
+        keys = tree.keys
+        for key in iterable:
+            if keys and key <= keys[-1]:
+                if key == keys[-1]:
+                    continue
+                raise ValueError('keys must be in ascending order')
+            keys.append(key)
+
+        count = len(keys)
+        tree.left = array('q', [cls.NIL]) * count
+        tree.right = array('q', [cls.NIL]) * count
+        tree.sizes = array('q', [0]) * count
+
+        def build(low, high):
+            if low >= high:
+                return cls.NIL
+            middle = (low + high) // 2
+            tree.left[middle] = build(low, middle)
+            tree.right[middle] = build(middle + 1, high)
+            tree.sizes[middle] = high - low
+            return middle
+
+        tree.root = build(0, count)
+        return tree
+
+    def save(self, path):
+        """
+        Write the tree to a file in the flat layout read by open.
+
+        The keys are written in sorted order as a perfectly balanced tree,
+        followed by the left, right and sizes arrays, all in native byte
+        order so that open can map them without decoding.
+
+        Parameters:
+        -----------
+        path : str or os.PathLike
+            The file to write.
+        """
+        tree = ArrayBinarySearchTree.from_sorted(self, self.typecode)
+        count = len(tree.keys)
+        with open(path, 'wb') as file:
+            file.write(self.HEADER.pack(self.MAGIC, self.typecode.encode(), count, tree.root))
+            tree.keys.tofile(file)
+            file.write(bytes(-file.tell() % 8))
+            tree.left.tofile(file)
+            tree.right.tofile(file)
+            tree.sizes.tofile(file)
+
+    @classmethod
+    def open(cls, path):
+        """
+        Map a file written by save as a read-only tree.
+
+        Nothing is loaded into Python objects: search, range and the other
+        queries read the memory-mapped file directly, so processes opening
+        the same file share one copy of it through the page cache.
+
+        Parameters:
+        -----------
+        path : str or os.PathLike
+            The file to open.
+
+        Returns:
+        --------
+        ArrayBinarySearchTree
+            A read-only tree backed by the file. Call close when done.
+
+        Raises:
+        -------
+        ValueError
+            If the file is not a saved tree, is truncated, or stores keys
+            with an unsupported typecode.
+        """
+        with open(path, 'rb') as file:
+            mapped = mmap.mmap(file.fileno(), 0, access=mmap.ACCESS_READ)
+        view = memoryview(mapped)
+        tree = None
+        try:
+            if len(view) < cls.HEADER.size:
+                raise ValueError(f'{path} is not a saved BinarySearchTree')
+            magic, typecode, count, root = cls.HEADER.unpack_from(view)
+            if magic != cls.MAGIC:
+                raise ValueError(f'{path} is not a saved BinarySearchTree')
+            typecode = typecode.decode('latin-1')
+            if typecode not in cls.TYPECODES:
+                raise ValueError(f'{path} has an unsupported key typecode {typecode!r}')
+            keys_end = cls.HEADER.size + count * array(typecode).itemsize
+            if count < 0 or not cls.NIL <= root < count:
+                raise ValueError(f'{path} has a corrupt header')
+            if len(view) < keys_end + -keys_end % 8 + 3 * count * 8:
+                raise ValueError(f'{path} is truncated')
+
+            tree = cls(typecode)
+            offset = cls.HEADER.size
+            tree.keys = view[offset:keys_end].cast(typecode)
+            offset = keys_end + -keys_end % 8
+            for name in ('left', 'right', 'sizes'):
+                end = offset + count * 8
+                setattr(tree, name, view[offset:end].cast('q'))
+                offset = end
+        except BaseException:
+            if tree is not None:
+                for name in ('keys', 'left', 'right', 'sizes'):
+                    if isinstance(getattr(tree, name), memoryview):
+                        getattr(tree, name).release()
+            view.release()
+            mapped.close()
+            raise
+
+        tree.root = root
+        tree._mmap = mapped
+        return tree
+
+    def close(self):
+        """
+        Release the memory map of a tree returned by open.
+        """
+        if self._mmap is None:
+            return
+        for name in ('keys', 'left', 'right', 'sizes'):
+            getattr(self, name).release()
+        self._mmap.close()
+        self._mmap = None
+
+    def __enter__(self):
+        """
+        Return the tree for use in a with statement.
+        """
+        return self
+
+    def __exit__(self, *exc_info):
+        """
+        Close the tree when leaving a with statement.
+        """
+        self.close()
+
+    def _check_writable(self):
+        """
+        Refuse to modify a tree backed by a read-only memory map.
+
+        Raises:
+        -------
+        TypeError
+            If the tree was returned by open.
+        """
+        if self._mmap is not None:
+            raise TypeError('a tree opened from a file is read-only')
+
+    def _size(self, index):
+        """
+        Return the size of a subtree, treating NIL as empty.
+
+        Parameters:
+        -----------
+        index : int
+            The slot index of the subtree root, or NIL.
+
+        Returns:
+        --------
+        int
+            The number of nodes in the subtree.
+        """
+        return self.sizes[index] if index != self.NIL else 0
+
+    def _find_path(self, key):
+        """
+        Walk down from the root towards a key.
+
+        Parameters:
+        -----------
+        key : int
+            The value to look for.
+
+        Returns:
+        --------
+        tuple of (list of int, int)
+            The slot indices of the ancestors visited on the way down (root
+            first), and the slot holding the key, or NIL if it is missing.
+        """
+        keys, left, right = self.keys, self.left, self.right
+        path = []
+        index = self.root
+        while index != self.NIL and keys[index] != key:
+            path.append(index)
+            index = left[index] if key < keys[index] else right[index]
+        return path, index
+
+    def _new_slot(self, key):
+        """
+        Store a key in a free slot, growing the arrays if none is free.
+
+        Parameters:
+        -----------
+        key : int
+            The value of the new node.
+
+        Returns:
+        --------
+        int
+            The slot index of the new node.
+        """
+        if self._free:
+            index = self._free.pop()
+            self.keys[index] = key
+            self.left[index] = self.NIL
+            self.right[index] = self.NIL
+            self.sizes[index] = 1
+            return index
+
+        self.keys.append(key)
+        self.left.append(self.NIL)
+        self.right.append(self.NIL)
+        self.sizes.append(1)
+        return len(self.keys) - 1
+
+    def _replace_child(self, parent, old, new):
+        """
+        Replace the child old of parent with new, updating the root if needed.
+
+        Parameters:
+        -----------
+        parent : int
+            The slot index of old's parent, or NIL if old is the root.
+        old : int
+            The slot index of the child to replace.
+        new : int
+            The slot index of the replacement child, or NIL.
+        """
+        if parent == self.NIL:
+            self.root = new
+        elif self.left[parent] == old:
+            self.left[parent] = new
+        else:
+            self.right[parent] = new
+
+    def insert(self, key):
+        """
+        Insert a key into the tree.
+
+        Parameters:
+        -----------
+        key : int
+            The value to insert.
+        """
+        self._check_writable()
+        path, index = self._find_path(key)
+        if index != self.NIL:
+            return
+
+        for ancestor in path:
+            self.sizes[ancestor] += 1
+        index = self._new_slot(key)
+        if not path:
+            self.root = index
+        elif key < self.keys[path[-1]]:
+            self.left[path[-1]] = index
+        else:
+            self.right[path[-1]] = index
+
+    def search(self, key):
+        """
+        Search for a key in the tree.
+
+        Parameters:
+        -----------
+        key : int
+            The value to search for.
+
+        Returns:
+        --------
+        int or None
+            The slot index holding the key, or None if not found.
+        """
+        keys, left, right = self.keys, self.left, self.right
+        index = self.root
+        while index != self.NIL:
+            node_key = keys[index]
+            if key == node_key:
+                return index
+            index = left[index] if key < node_key else right[index]
+        return None
+
+    def delete(self, key):
+        """
+        Delete a key from the tree.
+
+        Parameters:
+        -----------
+        key : int
+            The value to delete.
+        """
+        self._check_writable()
+        path, index = self._find_path(key)
+        if index == self.NIL:
+            return
+
+        left, right = self.left, self.right
+        if left[index] != self.NIL and right[index] != self.NIL:
+            path.append(index)
+            successor = right[index]
+            while left[successor] != self.NIL:
+                path.append(successor)
+                successor = left[successor]
+            self.keys[index] = self.keys[successor]
+            index = successor
+
+        for ancestor in path:
+            self.sizes[ancestor] -= 1
+        child = left[index] if left[index] != self.NIL else right[index]
+        self._replace_child(path[-1] if path else self.NIL, index, child)
+        self._free.append(index)
+
+    def __len__(self):
+        """
+        Return the number of keys in the tree.
+
+        Returns:
+        --------
+        int
+            The number of keys.
+        """
+        return self._size(self.root)
+
+    def __contains__(self, key):
+        """
+        Check whether a key is in the tree.
+
+        Parameters:
+        -----------
+        key : int
+            The value to look for.
+
+        Returns:
+        --------
+        bool
+            True if the key is present, False otherwise.
+        """
+        return self.search(key) is not None
+
+    def __iter__(self):
+        """
+        Lazily yield the keys of the tree in order.
+
+        Yields:
+        -------
+        int
+            The next key in in-order.
+        """
+        return self.range(float('-inf'), float('inf'))
 
     def inorder_traversal(self):
         """
-        Perform in-order traversal of the BST.
+        Perform in-order traversal of the tree.
 
         Returns:
         --------
         list of int
-            The list of node values in in-order.
+            The list of keys in in-order.
+        """
+        return list(self)
+
+    def range(self, low, high):
+        """
+        Lazily yield the keys k with low <= k < high in order.
+
+        Subtrees entirely outside the range are never visited.
+
+        Parameters:
+        -----------
+        low : int
+            The inclusive lower bound.
+        high : int
+            The exclusive upper bound.
+
+        Yields:
+        -------
+        int
+            The next key in the range.
+        """
+        keys, left, right = self.keys, self.left, self.right
+        stack = []
+        index = self.root
+        while stack or index != self.NIL:
+            while index != self.NIL:
+                if keys[index] < low:
+                    index = right[index]
+                else:
+                    stack.append(index)
+                    index = left[index]
+            if not stack:
+                return
+            index = stack.pop()
+            key = keys[index]
+            if key >= high:
+                return
+            yield key
+            index = right[index]
+
+    def floor(self, key):
+        """
+        Find the largest key less than or equal to key.
+
+        Parameters:
+        -----------
+        key : int
+            The value to look up.
+
+        Returns:
+        --------
+        int or None
+            The floor of key, or None if every key is greater.
         """
-        result = []
-        self._inorder_traversal(self.root, result)
+        result = None
+        index = self.root
+        while index != self.NIL:
+            node_key = self.keys[index]
+            if node_key == key:
+                return node_key
+            if node_key < key:
+                result = node_key
+                index = self.right[index]
+            else:
+                index = self.left[index]
         return result
 
+    def ceiling(self, key):
+        """
+        Find the smallest key greater than or equal to key.
+
+        Parameters:
+        -----------
+        key : int
+            The value to look up.
+
+        Returns:
+        --------
+        int or None
+            The ceiling of key, or None if every key is smaller.
+        """
+        result = None
+        index = self.root
+        while index != self.NIL:
+            node_key = self.keys[index]
+            if node_key == key:
+                return node_key
+            if node_key > key:
+                result = node_key
+                index = self.left[index]
+            else:
+                index = self.right[index]
+        return result
+
+    def rank(self, key):
+        """
+        Count the keys strictly less than key.
+
+        Parameters:
+        -----------
+        key : int
+            The value to rank.
+
+        Returns:
+        --------
+        int
+            The number of keys smaller than key.
+        """
+        rank = 0
+        index = self.root
+        while index != self.NIL:
+            if key <= self.keys[index]:
+                index = self.left[index]
+            else:
+                rank += self._size(self.left[index]) + 1
+                index = self.right[index]
+        return rank
+
+    def select(self, index):
+        """
+        Return the key with the given zero-based position in sorted order.
+
+        Parameters:
+        -----------
+        index : int
+            The position of the key, so that select(rank(k)) == k.
+
+        Returns:
+        --------
+        int
+            The key at that position.
+
+        Raises:
+        -------
+        IndexError
+            If index is outside 0 <= index < len(tree).
+        """
+        if not 0 <= index < len(self):
+            raise IndexError('select index out of range')
+        slot = self.root
+        while True:
+            left_size = self._size(self.left[slot])
+            if index < left_size:
+                slot = self.left[slot]
+            elif index == left_size:
+                return self.keys[slot]
+            else:
+                index -= left_size + 1
+                slot = self.right[slot]
+
+
+def benchmark_sorted_inserts(num_keys=10**6):
+    """
+    Insert, search and delete sorted keys in an AVLTree and report the timings.
+
+    Sorted input is the worst case for an unbalanced BinarySearchTree, which
+    degrades into a linked list with O(n) operations.
+
+    Parameters:
+    -----------
+    num_keys : int
+        The number of sorted keys to insert.
+
+    Returns:
+    --------
+    dict
+        The final tree height, the log2 bound for comparison, and the mean
+        per-operation latency in microseconds for insert, search and delete.
+    """
+    tree = AVLTree()
+    keys = range(num_keys)
+
+    start = time.perf_counter()
+    for key in keys:
+        tree.insert(key)
+    insert_time = time.perf_counter() - start
+    height = tree.height()
+
+    start = time.perf_counter()
+    for key in keys:
+        tree.search(key)
+    search_time = time.perf_counter() - start
+
+    start = time.perf_counter()
+    for key in keys:
+        tree.delete(key)
+    delete_time = time.perf_counter() - start
+
+    results = {
+        'keys': num_keys,
+        'height': height,
+        'log2_keys': num_keys.bit_length(),
+        'insert_us': insert_time / num_keys * 1e6,
+        'search_us': search_time / num_keys * 1e6,
+        'delete_us': delete_time / num_keys * 1e6,
+    }
+    print(f"{num_keys} sorted keys: height {height} "
+          f"(log2 bound ~{results['log2_keys']})")
+    for operation in ('insert', 'search', 'delete'):
+        print(f"{operation:>6}: {results[operation + '_us']:.2f} us/op")
+    return results
+
+
+def benchmark_memory(num_keys=10**6):
+    """
+    Compare the memory cost per key of the tree backends.
+
+    Each backend is bulk-loaded with the same keys via from_sorted and
+    measured with tracemalloc, so the figures include the key objects the
+    pointer-based trees keep alive.
+
+    Parameters:
+    -----------
+    num_keys : int
+        The number of keys to load into each backend.
+
+    Returns:
+    --------
+    dict
+        The bytes per key for each backend, keyed by class name.
+    """
+    results = {}
+    for backend in (BinarySearchTree, AVLTree, ArrayBinarySearchTree):
+        tracemalloc.start()
+        tree = backend.from_sorted(range(num_keys))
+        used, _ = tracemalloc.get_traced_memory()
+        tracemalloc.stop()
+        del tree
+        results[backend.__name__] = used / num_keys
+        print(f'{backend.__name__:>21}: {results[backend.__name__]:.1f} bytes/key')
+    return results
+
 
 # Example usage
 bst = BinarySearchTree()
@@ -1,3 +1,14 @@
+import heapq
+import os
+import random
+import tempfile
+import time
+from array import array
+from collections import deque
+from concurrent.futures import ProcessPoolExecutor
+from multiprocessing import shared_memory
+
+
 def merge_sort(array):
     if len(array) <= 1:
         return
@@ -33,6 +44,232 @@ def merge_sort(array):
         sorted_index += 1
 
 
+def _insertion_sort(items, start, end):
+    """Sort items[start:end] in place; fast for the short runs merge sort starts from."""
+    for index in range(start + 1, end):
+        value = items[index]
+        position = index - 1
+        while position >= start and value < items[position]:
+            items[position + 1] = items[position]
+            position -= 1
+        items[position + 1] = value
+
+
+def _merge_runs(source, target, start, middle, end):
+    """Merge the sorted runs source[start:middle] and source[middle:end] into target[start:end]."""
+    if middle >= end or source[middle - 1] <= source[middle]:
+        for index in range(start, end):
+            target[index] = source[index]
+        return
+
+    left_array_index = start
+    right_array_index = middle
+    sorted_index = start
+
+    while left_array_index < middle and right_array_index < end:
+        if source[right_array_index] < source[left_array_index]:
+            target[sorted_index] = source[right_array_index]
+            right_array_index += 1
+        else:
+            target[sorted_index] = source[left_array_index]
+            left_array_index += 1
+        sorted_index += 1
+
+    while left_array_index < middle:
+        target[sorted_index] = source[left_array_index]
+        left_array_index += 1
+        sorted_index += 1
+
+    while right_array_index < end:
+        target[sorted_index] = source[right_array_index]
+        right_array_index += 1
+        sorted_index += 1
+
+
+def merge_sort_bottom_up(items, key=None, run_size=32):
+    """
+    Stable, iterative merge sort of a list in place.
+
+    Runs of run_size elements are insertion-sorted first, then merged in
+    passes of doubling width that alternate between the list and a single
+    scratch buffer allocated up front, instead of slicing at every level.
+    With key, the list is sorted by key(item), computed once per item.
+    """
+    length = len(items)
+    if key is not None:
+        decorated = [(key(item), index) for index, item in enumerate(items)]
+        merge_sort_bottom_up(decorated, run_size=run_size)
+        items[:] = [items[index] for _, index in decorated]
+        return
+
+    for start in range(0, length, run_size):
+        _insertion_sort(items, start, min(start + run_size, length))
+
+    source, target = items, [None] * length
+    width = run_size
+    while width < length:
+        for start in range(0, length, 2 * width):
+            _merge_runs(source, target, start, min(start + width, length),
+                        min(start + 2 * width, length))
+        source, target = target, source
+        width *= 2
+
+    if source is not items:
+        items[:] = source
+
+
+def _read_records(file, typecode, block_records):
+    """Yield the records of a binary file of array(typecode) items, reading block_records at a time."""
+    itemsize = array(typecode).itemsize
+    while data := file.read(block_records * itemsize):
+        if len(data) % itemsize:
+            raise ValueError(f'file size is not a multiple of the {itemsize}-byte record size')
+        block = array(typecode)
+        block.frombytes(data)
+        yield from block
+
+
+def external_sort(input_path, output_path, typecode='d', chunk_records=10**6, temp_dir=None):
+    """
+    Sort a binary file of fixed-size numeric records that may not fit in memory.
+
+    The input is a flat file of array(typecode) items in native byte order,
+    such as one written by array.tofile. It is read chunk_records at a time,
+    each chunk is sorted with merge_sort_bottom_up and spilled to a temporary
+    run file, and the runs are k-way merged with heapq.merge into the output,
+    which is written block by block. Peak memory is about chunk_records
+    Python numbers (roughly 40 bytes each) regardless of the file size.
+    """
+    itemsize = array(typecode).itemsize
+    with tempfile.TemporaryDirectory(dir=temp_dir) as run_dir:
+        run_paths = []
+        with open(input_path, 'rb') as input_file:
+            while data := input_file.read(chunk_records * itemsize):
+                if len(data) % itemsize:
+                    raise ValueError(f'file size is not a multiple of the {itemsize}-byte record size')
+                chunk = array(typecode)
+                chunk.frombytes(data)
+                del data
+                records = chunk.tolist()
+                del chunk
+                merge_sort_bottom_up(records)
+                run_path = os.path.join(run_dir, f'run{len(run_paths)}')
+                with open(run_path, 'wb') as run_file:
+                    array(typecode, records).tofile(run_file)
+                del records
+                run_paths.append(run_path)
+
+        block_records = max(chunk_records // (len(run_paths) + 1), 1)
+        run_files = [open(run_path, 'rb') for run_path in run_paths]
+        try:
+            runs = [_read_records(run_file, typecode, block_records) for run_file in run_files]
+            with open(output_path, 'wb') as output_file:
+                block = array(typecode)
+                for record in heapq.merge(*runs):
+                    block.append(record)
+                    if len(block) >= block_records:
+                        block.tofile(output_file)
+                        block = array(typecode)
+                block.tofile(output_file)
+        finally:
+            for run_file in run_files:
+                run_file.close()
+
+
+def _sort_shared_partition(name, typecode, start, end):
+    """Sort records[start:end] of the shared-memory block called name in place, in a worker process."""
+    block = shared_memory.SharedMemory(name=name)
+    records = block.buf.cast(typecode)
+    try:
+        partition = records[start:end].tolist()
+        merge_sort_bottom_up(partition)
+        records[start:end] = array(typecode, partition)
+    finally:
+        records.release()
+        block.close()
+
+
+def parallel_merge_sort(numbers, typecode=None, workers=None):
+    """
+    Sort a list of numbers in place using a pool of worker processes.
+
+    The numbers are copied once into a multiprocessing.shared_memory block
+    as array(typecode) items. Each worker sorts one contiguous partition of
+    the block in place, so only the block name and partition bounds are
+    pickled. The parent then k-way merges the sorted partitions back into
+    the list. The typecode defaults to 'q' when every number is an int and
+    'd' otherwise. A ValueError is raised if a number would not survive the
+    round trip through typecode. The list keeps its original objects, so
+    ints stay ints.
+    """
+    length = len(numbers)
+    workers = workers or os.cpu_count()
+    if length < 2:
+        return
+
+    if typecode is None:
+        typecode = 'q' if all(isinstance(number, int) for number in numbers) else 'd'
+    converted = array(typecode, numbers)
+    item_type = type(converted[0])
+    same_type = all(type(number) is item_type for number in numbers)
+    for value, number in zip(converted, numbers):
+        if value != number and not (same_type and number != number):
+            raise ValueError(f'{number!r} cannot be stored exactly as typecode {typecode!r}')
+
+    block = shared_memory.SharedMemory(create=True, size=length * converted.itemsize)
+    records = block.buf.cast(typecode)
+    try:
+        records[:length] = converted
+        del converted
+        bounds = [length * part // workers for part in range(workers + 1)]
+        partitions = [(start, end) for start, end in zip(bounds, bounds[1:]) if start < end]
+        with ProcessPoolExecutor(max_workers=workers) as executor:
+            futures = [executor.submit(_sort_shared_partition, block.name, typecode, start, end)
+                       for start, end in partitions]
+            for future in futures:
+                future.result()
+        merged = heapq.merge(*(records[start:end] for start, end in partitions))
+        if same_type:
+            numbers[:] = merged
+        else:
+            originals = {}
+            for number in numbers:
+                originals.setdefault(number, deque()).append(number)
+            numbers[:] = [originals[value].popleft() for value in merged]
+    finally:
+        records.release()
+        block.close()
+        block.unlink()
+
+
+def benchmark(sizes=(10**5, 10**6, 10**7)):
+    """Print the time merge_sort and merge_sort_bottom_up take on random floats of each size."""
+    for size in sizes:
+        numbers = [random.random() for _ in range(size)]
+        for sort in (merge_sort, merge_sort_bottom_up):
+            data = numbers[:]
+            start = time.perf_counter()
+            sort(data)
+            elapsed = time.perf_counter() - start
+            print(f'{sort.__name__:>20} n={size:>9}: {elapsed:.2f} s')
+
+
+def benchmark_parallel(size=10**7, worker_counts=(8, 16)):
+    """Print the speedup of parallel_merge_sort over single-core merge_sort on random floats."""
+    numbers = [random.random() for _ in range(size)]
+    data = numbers[:]
+    start = time.perf_counter()
+    merge_sort(data)
+    baseline = time.perf_counter() - start
+    print(f'merge_sort n={size}: {baseline:.2f} s')
+    for workers in worker_counts:
+        data = numbers[:]
+        start = time.perf_counter()
+        parallel_merge_sort(data, workers=workers)
+        elapsed = time.perf_counter() - start
+        print(f'parallel_merge_sort workers={workers}: {elapsed:.2f} s ({baseline / elapsed:.2f}x)')
+
+
 if __name__ == '__main__':
     numbers = [4, 10, 6, 14, 2, 1, 8, 5]
     print('Unsorted array: ')
@@ -1,44 +1,285 @@
 import copy
+import math
+import os
 import random
+import time
+from collections import Counter, deque
+from concurrent.futures import ProcessPoolExecutor
+from functools import lru_cache
+from itertools import islice
+from statistics import NormalDist
+
+try:
+    import numpy as np
+except ImportError:
+    np = None
 
 
 class Hat:
+    """
+    A hat of colored balls drawn without replacement.
+
+    The balls still in the hat are the first _remaining items of _balls.
+    Drawing swaps a random remaining ball to the end of that prefix and
+    shrinks it (a partial Fisher-Yates shuffle), so each ball costs O(1)
+    regardless of the hat size, and reset or restore only move the
+    boundary back instead of copying the hat.
+    """
+
     def __init__(self, **kwargs):
-        self.contents = []
+        self._balls = []
         for color, count in kwargs.items():
-            self.contents.extend([color] * count)
+            self._balls.extend([color] * count)
+        self._remaining = len(self._balls)
+        self._counts = Counter(self._balls)
+
+    @property
+    def contents(self):
+        """A new list of the balls still in the hat; changing it does not change the hat."""
+        return self._balls[:self._remaining]
+
+    def _color_counts(self):
+        """Return a Counter of the balls still in the hat, without copying them into a list."""
+        if self._remaining == len(self._balls):
+            return self._counts.copy()
+        return Counter(islice(self._balls, self._remaining))
 
     def draw(self, num_balls):
-        if num_balls >= len(self.contents):
-            drawn_balls = self.contents[:]
-            self.contents.clear()
+        if num_balls >= self._remaining:
+            drawn_balls = self._balls[:self._remaining]
+            self._remaining = 0
             return drawn_balls
 
-        draw_balls = random.sample(self.contents, num_balls)
-        for ball in draw_balls:
-            self.contents.remove(ball)
+        balls = self._balls
+        draw_balls = []
+        for _ in range(num_balls):
+            index = random.randrange(self._remaining)
+            self._remaining -= 1
+            last = self._remaining
+            balls[index], balls[last] = balls[last], balls[index]
+            draw_balls.append(balls[last])
 
         return draw_balls
 
+    def snapshot(self):
+        """Return a token that restore can use to put back every ball drawn after this call."""
+        return self._remaining
+
+    def restore(self, snapshot):
+        """Put back the balls drawn since snapshot was taken, in O(1)."""
+        self._remaining = snapshot
+
+    def reset(self):
+        """Put every ball back in the hat, in O(1)."""
+        self._remaining = len(self._balls)
+
 
 def experiment(hat, expected_balls, num_balls_drawn, num_experiments):
+    """
+    Estimate the probability of drawing at least expected_balls by repeated draws.
+
+    The drawn balls are put back after every trial, so the hat ends with the
+    same balls it started with, possibly in a different order.
+    """
     success_count = 0
+    state = hat.snapshot()
 
     for _ in range(num_experiments):
-        temp_hat = copy.deepcopy(hat)
-        drawn_balls = temp_hat.draw(num_balls_drawn)
-        drawn_counts = {color: drawn_balls.count(
-            color) for color in set(drawn_balls)}
+        drawn_balls = hat.draw(num_balls_drawn)
+        hat.restore(state)
+        drawn_counts = Counter(drawn_balls)
 
-        if all(drawn_counts.get(color, 0) >= count for color, count in expected_balls.items()):
+        if all(drawn_counts[color] >= count for color, count in expected_balls.items()):
             success_count += 1
 
     return success_count / num_experiments
 
 
-hat = Hat(black=6, red=4, green=3)
-probability = experiment(hat=hat,
-                         expected_balls={'red': 2, 'green': 1},
-                         num_balls_drawn=5,
-                         num_experiments=2000)
-print(probability)
+def _draw_counts(hat, expected_balls, num_balls_drawn):
+    """
+    Return the per-color ball counts, required counts and draw size for _count_successes.
+
+    The colors not in expected_balls are lumped together in the last entry.
+    """
+    color_counts = hat._color_counts()
+    total_balls = sum(color_counts.values())
+    colors = [color for color, count in expected_balls.items() if count > 0]
+    other_balls = total_balls - sum(color_counts[color] for color in colors)
+    counts = np.array([color_counts[color] for color in colors] + [other_balls], dtype=np.int64)
+    required = np.array([expected_balls[color] for color in colors] + [0], dtype=np.int64)
+    return counts, required, min(num_balls_drawn, total_balls)
+
+
+def _count_successes(counts, required, num_balls_drawn, num_experiments, rng, batch_size):
+    """Run num_experiments vectorized trials with rng and return how many succeeded."""
+    if (required > counts).any():
+        return 0
+
+    success_count = 0
+    remaining = num_experiments
+    while remaining > 0:
+        size = min(batch_size, remaining)
+        drawn_counts = rng.multivariate_hypergeometric(counts, num_balls_drawn, size=size)
+        success_count += int(np.count_nonzero((drawn_counts >= required).all(axis=1)))
+        remaining -= size
+    return success_count
+
+
+def experiment_vectorized(hat, expected_balls, num_balls_drawn, num_experiments,
+                          seed=None, batch_size=10**6):
+    """
+    Estimate the same probability as experiment with all trials drawn at once in NumPy.
+
+    Each trial's per-color counts come straight from a multivariate
+    hypergeometric sample of the hat's color counts, with the colors not in
+    expected_balls lumped together, so no balls are copied or removed.
+    Trials run in batches of batch_size to bound memory. Pass seed for
+    reproducible results.
+    """
+    if np is None:
+        raise ImportError('experiment_vectorized requires numpy')
+
+    rng = np.random.default_rng(seed)
+    counts, required, num_balls_drawn = _draw_counts(hat, expected_balls, num_balls_drawn)
+    success_count = _count_successes(counts, required, num_balls_drawn, num_experiments,
+                                     rng, batch_size)
+    return success_count / num_experiments
+
+
+@lru_cache(maxsize=None)
+def binomial(n, k):
+    """Return n choose k, memoized so repeated exact queries reuse earlier terms."""
+    return math.comb(n, k)
+
+
+def exact_probability(hat, expected_balls, num_balls_drawn):
+    """
+    Return the exact probability that experiment estimates.
+
+    Counts the draws with at least the expected number of each color using
+    the multivariate hypergeometric distribution. The ways to reach each
+    total from the expected colors are built up one color at a time, then
+    combined with the ways to fill the rest of the draw from the other
+    balls, all in exact integer arithmetic.
+    """
+    color_counts = hat._color_counts()
+    total_balls = sum(color_counts.values())
+    num_balls_drawn = min(num_balls_drawn, total_balls)
+    colors = [color for color, count in expected_balls.items() if count > 0]
+    other_balls = total_balls - sum(color_counts[color] for color in colors)
+
+    ways = {0: 1}
+    for color in colors:
+        available = color_counts[color]
+        next_ways = {}
+        for drawn, count in ways.items():
+            for taken in range(expected_balls[color], min(available, num_balls_drawn - drawn) + 1):
+                next_ways[drawn + taken] = (next_ways.get(drawn + taken, 0)
+                                            + count * binomial(available, taken))
+        ways = next_ways
+
+    successes = sum(count * binomial(other_balls, num_balls_drawn - drawn)
+                    for drawn, count in ways.items())
+    return successes / binomial(total_balls, num_balls_drawn)
+
+
+def _experiment_batch(counts, required, num_balls_drawn, num_experiments, seed_sequence):
+    """Run one batch of trials in a worker process on its own RNG stream."""
+    rng = np.random.default_rng(seed_sequence)
+    return _count_successes(counts, required, num_balls_drawn, num_experiments,
+                            rng, num_experiments)
+
+
+def confidence_interval(successes, trials, confidence=0.95, method='wilson'):
+    """Return the (low, high) confidence interval of a success rate, by the Wilson or normal method."""
+    z = NormalDist().inv_cdf(0.5 + confidence / 2)
+    estimate = successes / trials
+    if method == 'normal':
+        half_width = z * math.sqrt(estimate * (1 - estimate) / trials)
+        return max(estimate - half_width, 0.0), min(estimate + half_width, 1.0)
+    if method != 'wilson':
+        raise ValueError(f"method must be 'wilson' or 'normal', not {method!r}")
+
+    scale = 1 + z**2 / trials
+    center = (estimate + z**2 / (2 * trials)) / scale
+    half_width = z * math.sqrt(estimate * (1 - estimate) / trials + z**2 / (4 * trials**2)) / scale
+    return max(center - half_width, 0.0), min(center + half_width, 1.0)
+
+
+def experiment_stream(hat, expected_balls, num_balls_drawn, max_experiments,
+                      precision=None, confidence=0.95, method='wilson',
+                      batch_size=100_000, workers=None, seed=None):
+    """
+    Run experiment in parallel batches, yielding running estimates until precise enough.
+
+    Batches of batch_size trials run on a process pool, each on an
+    independent RNG stream spawned from one numpy SeedSequence, so results
+    are reproducible for a given seed. After each batch, in submission order,
+    this yields (num_experiments, probability, low, high) with the confidence
+    interval of the running estimate. It stops once the interval's half-width
+    is at most precision, or after max_experiments trials, and cancels any
+    batches still queued. The hat's color counts are tallied once here, so
+    workers receive a few small arrays instead of the whole hat.
+    """
+    if np is None:
+        raise ImportError('experiment_stream requires numpy')
+
+    workers = workers or os.cpu_count()
+    counts, required, num_balls_drawn = _draw_counts(hat, expected_balls, num_balls_drawn)
+    seed_sequence = np.random.SeedSequence(seed)
+    submitted = trials = success_count = 0
+    pending = deque()
+    executor = ProcessPoolExecutor(max_workers=workers)
+    try:
+        while True:
+            while len(pending) < 2 * workers and submitted < max_experiments:
+                size = min(batch_size, max_experiments - submitted)
+                pending.append((size, executor.submit(
+                    _experiment_batch, counts, required, num_balls_drawn, size,
+                    seed_sequence.spawn(1)[0])))
+                submitted += size
+            if not pending:
+                return
+
+            size, future = pending.popleft()
+            success_count += future.result()
+            trials += size
+            low, high = confidence_interval(success_count, trials, confidence, method)
+            yield trials, success_count / trials, low, high
+            if precision is not None and (high - low) / 2 <= precision:
+                return
+    finally:
+        executor.shutdown(cancel_futures=True)
+
+
+def benchmark_draw(sizes=(10**3, 10**4, 10**5, 10**6), num_balls=10, repeats=1000):
+    """Print the time per draw-and-restore for growing hat sizes, next to the list.remove approach."""
+    for size in sizes:
+        hat = Hat(red=size // 2, blue=size - size // 2)
+        state = hat.snapshot()
+        start = time.perf_counter()
+        for _ in range(repeats):
+            hat.draw(num_balls)
+            hat.restore(state)
+        draw_time = (time.perf_counter() - start) / repeats
+
+        contents = hat.contents
+        legacy_repeats = max(repeats // 100, 1)
+        start = time.perf_counter()
+        for _ in range(legacy_repeats):
+            balls = copy.deepcopy(contents)
+            for ball in random.sample(balls, num_balls):
+                balls.remove(ball)
+        legacy_time = (time.perf_counter() - start) / legacy_repeats
+
+        print(f'{size:>9} balls: draw+restore {draw_time * 1e6:8.2f} us, '
+              f'deepcopy+remove {legacy_time * 1e6:10.2f} us')
+
+
+if __name__ == '__main__':
+    hat = Hat(black=6, red=4, green=3)
+    probability = experiment(hat=hat,
+                             expected_balls={'red': 2, 'green': 1},
+                             num_balls_drawn=5,
+                             num_experiments=2000)
+    print(probability)
@@ -1,4 +1,13 @@
 import math
+import os
+import time
+from collections import deque
+from concurrent.futures import ProcessPoolExecutor
+
+try:
+    import numpy as np
+except ImportError:
+    np = None
 
 GRAVITATIONAL_ACCELERATION = 9.81
 PROJECTILE = "∙"
@@ -47,6 +56,16 @@ displacement: {round(self.__calculate_displacement(), 1)} m
             for x in range(math.ceil(self.__calculate_displacement()))
         ]
 
+    def sample_coordinates(self, step=1, num_points=None):
+        if np is None:
+            raise ImportError('sample_coordinates requires numpy')
+        engine = TrajectoryEngine(self.__speed, self.__height, math.degrees(self.__angle))
+        if num_points is not None:
+            x, y = engine.sample(num_points)
+            return x[0], y[0]
+        x = np.arange(0, engine.displacements[0], step)
+        return x, engine.y_at(x)[0]
+
     @property
     def height(self):
         return self.__height
@@ -75,6 +94,147 @@ displacement: {round(self.__calculate_displacement(), 1)} m
         return f'{self.__class__}({self.speed}, {self.height}, {self.angle})'
 
 
+class TrajectoryEngine:
+    """
+    Vectorized trajectories for a whole fleet of projectiles at once.
+
+    speeds, heights and angles (in degrees, like Projectile) may be scalars
+    or arrays of the same shape. The per-projectile constants of the
+    trajectory y = height + slope * x - curvature * x**2 and the horizontal
+    displacement are computed once, as NumPy arrays with one entry per
+    projectile. from_projectiles reads each Projectile's angle property,
+    which is rounded to whole degrees.
+    """
+
+    def __init__(self, speeds, heights, angles):
+        if np is None:
+            raise ImportError('TrajectoryEngine requires numpy')
+        speeds, heights, angles = np.broadcast_arrays(
+            np.atleast_1d(np.asarray(speeds, dtype=float)),
+            np.atleast_1d(np.asarray(heights, dtype=float)),
+            np.radians(np.atleast_1d(np.asarray(angles, dtype=float))))
+        self.speeds = speeds.ravel()
+        self.heights = heights.ravel()
+        self.angles = angles.ravel()
+
+        horizontal = self.speeds * np.cos(self.angles)
+        vertical = self.speeds * np.sin(self.angles)
+        self.slopes = np.tan(self.angles)
+        self.curvatures = GRAVITATIONAL_ACCELERATION / (2 * horizontal**2)
+        self.flight_times = (
+            vertical + np.sqrt(vertical**2 + 2 * GRAVITATIONAL_ACCELERATION * self.heights)
+        ) / GRAVITATIONAL_ACCELERATION
+        self.displacements = horizontal * self.flight_times
+        self.apex_heights = self.heights + np.maximum(vertical, 0)**2 / (
+            2 * GRAVITATIONAL_ACCELERATION)
+
+    @classmethod
+    def from_projectiles(cls, projectiles):
+        projectiles = list(projectiles)
+        return cls([ball.speed for ball in projectiles],
+                   [ball.height for ball in projectiles],
+                   [ball.angle for ball in projectiles])
+
+    def __len__(self):
+        return len(self.speeds)
+
+    def y_at(self, x):
+        x = np.asarray(x, dtype=float)
+        if x.ndim < 2:
+            x = np.broadcast_to(x, (len(self), x.size) if x.ndim else (len(self), 1))
+        return (self.heights[:, None] + self.slopes[:, None] * x
+                - self.curvatures[:, None] * x**2)
+
+    def sample(self, num_points=100):
+        fractions = np.linspace(0, 1, num_points)
+        x = self.displacements[:, None] * fractions
+        return x, self.y_at(x)
+
+
+SWEEP_COLUMNS = ('speed', 'height', 'angle', 'displacement', 'apex', 'flight_time')
+
+# The parameter grids shared by sweep worker processes, set once per worker by
+# _init_sweep_worker.
+_sweep_grids = None
+
+
+def _init_sweep_worker(grids):
+    global _sweep_grids
+    _sweep_grids = grids
+
+
+def _sweep_chunk(start, end):
+    speeds, heights, angles = _sweep_grids
+    speed_index, height_index, angle_index = np.unravel_index(
+        np.arange(start, end), (len(speeds), len(heights), len(angles)))
+    engine = TrajectoryEngine(speeds[speed_index], heights[height_index], angles[angle_index])
+    return np.column_stack((engine.speeds, engine.heights, np.degrees(engine.angles),
+                            engine.displacements, engine.apex_heights, engine.flight_times))
+
+
+def sweep(speeds, heights, angles, chunksize=100_000, workers=None):
+    """
+    Evaluate every (speed, height, angle) combination of the grids on a process pool.
+
+    Combinations are numbered in row-major order over (speeds, heights,
+    angles) and split into chunks of chunksize, each evaluated with a
+    TrajectoryEngine in a worker. Only a few chunks per worker are in flight
+    at a time. Yields one array per chunk, in order, with the columns listed
+    in SWEEP_COLUMNS. Nothing is printed.
+    """
+    if np is None:
+        raise ImportError('sweep requires numpy')
+    grids = tuple(np.atleast_1d(np.asarray(grid, dtype=float)) for grid in (speeds, heights, angles))
+    total = len(grids[0]) * len(grids[1]) * len(grids[2])
+    workers = workers or os.cpu_count()
+
+    with ProcessPoolExecutor(max_workers=workers, initializer=_init_sweep_worker,
+                             initargs=(grids,)) as executor:
+        pending = deque()
+        next_start = 0
+        while pending or next_start < total:
+            while len(pending) < 2 * workers and next_start < total:
+                end = min(next_start + chunksize, total)
+                pending.append(executor.submit(_sweep_chunk, next_start, end))
+                next_start = end
+            yield pending.popleft().result()
+
+
+def sweep_to_file(path, speeds, heights, angles, chunksize=100_000, workers=None):
+    """
+    Run sweep and stream its rows to a .csv or .npy file as chunks complete.
+
+    A .npy file is created at its full size up front and filled through a
+    memory map, so neither format holds the whole table in memory. Returns
+    the number of combinations, the elapsed seconds and the throughput in
+    combinations per second.
+    """
+    if np is None:
+        raise ImportError('sweep_to_file requires numpy')
+    total = np.size(speeds) * np.size(heights) * np.size(angles)
+    chunks = sweep(speeds, heights, angles, chunksize, workers)
+    start = time.perf_counter()
+
+    if str(path).endswith('.npy'):
+        table = np.lib.format.open_memmap(path, mode='w+', dtype=float,
+                                          shape=(total, len(SWEEP_COLUMNS)))
+        row = 0
+        for chunk in chunks:
+            table[row:row + len(chunk)] = chunk
+            row += len(chunk)
+        table.flush()
+        del table
+    else:
+        with open(path, 'w') as file:
+            file.write(','.join(SWEEP_COLUMNS) + '\n')
+            for chunk in chunks:
+                np.savetxt(file, chunk, delimiter=',', fmt='%.6g')
+
+    elapsed = time.perf_counter() - start
+    return {'combinations': total, 'seconds': elapsed,
+            'per_second': total / elapsed if elapsed else float('inf')}
+
+
 class Graph:
     __slots__ = ('__coordinates')
 
@@ -125,4 +285,5 @@ def projectile_helper(speed, height, angle):
     print(graph.create_trajectory())
 
 
-projectile_helper(30, 5, 60)
+if __name__ == '__main__':
+    projectile_helper(30, 5, 60)
@@ -1,3 +1,11 @@
+import heapq
+import os
+import pickle
+import time
+from array import array
+from collections import OrderedDict
+from concurrent.futures import ProcessPoolExecutor
+
 my_graph = {
     'A': [('B', 5), ('C', 3), ('E', 11)],
     'B': [('A', 5), ('C', 1), ('F', 2)],
@@ -8,6 +16,578 @@ my_graph = {
 }
 
 
+class CSRGraph:
+    """
+    A compact weighted directed graph in compressed sparse row (CSR) form.
+
+    Nodes are numbered 0..n-1. The edges leaving node i are stored in
+    targets[offsets[i]:offsets[i + 1]] with the matching weights, all in typed
+    arrays, so an edge costs 4 bytes for its target plus 4 or 8 bytes for its
+    weight instead of a tuple in a list. A graph with 50M edges and float32
+    weights ('f') fits in about 400 MB.
+
+    Attributes:
+    names (list): The name of each node, indexed by node id.
+    ids (dict): The node id of each name.
+    offsets (array): For each node id, the index of its first outgoing edge, plus a final
+                     entry holding the number of edges.
+    targets (array): The target node id of each edge.
+    weights (array): The weight of each edge.
+    """
+
+    def __init__(self, names, offsets, targets, weights):
+        self.names = names
+        self.ids = {name: node_id for node_id, name in enumerate(names)}
+        self.offsets = offsets
+        self.targets = targets
+        self.weights = weights
+
+    @classmethod
+    def from_edges(cls, edges, directed=True, weight_typecode='d'):
+        """
+        Build a graph from (source, target, weight) triples.
+
+        Parameters:
+        edges (iterable): The edges as (source, target, weight) tuples of node names.
+        directed (bool, optional): If False, every edge is also added in the reverse direction.
+        weight_typecode (str, optional): The array typecode of the weights, 'd' (float64) or
+                                         'f' (float32) to halve their memory.
+
+        Returns:
+        CSRGraph: The new graph.
+        """
+        names = []
+        ids = {}
+        sources = array('i')
+        targets = array('i')
+        weights = array(weight_typecode)
+
+        def node_id(name):
+            if name not in ids:
+                ids[name] = len(names)
+                names.append(name)
+            return ids[name]
+
+        for source, target, weight in edges:
+            source_id, target_id = node_id(source), node_id(target)
+            sources.append(source_id)
+            targets.append(target_id)
+            weights.append(weight)
+            if not directed:
+                sources.append(target_id)
+                targets.append(source_id)
+                weights.append(weight)
+
+        return cls._from_arrays(names, sources, targets, weights)
+
+    @classmethod
+    def from_dict(cls, graph, weight_typecode='d'):
+        """
+        Build a graph from the dict-of-lists layout used by shortest_path.
+
+        Parameters:
+        graph (dict): A dictionary mapping each node to a list of (neighbor, distance) tuples.
+        weight_typecode (str, optional): The array typecode of the weights.
+
+        Returns:
+        CSRGraph: The new graph, with node ids following the order of the dict.
+        """
+        names = list(graph)
+        ids = {name: node_id for node_id, name in enumerate(names)}
+        sources = array('i')
+        targets = array('i')
+        weights = array(weight_typecode)
+        for name, edges in graph.items():
+            for neighbor, weight in edges:
+                if neighbor not in ids:
+                    ids[neighbor] = len(names)
+                    names.append(neighbor)
+                sources.append(ids[name])
+                targets.append(ids[neighbor])
+                weights.append(weight)
+
+        return cls._from_arrays(names, sources, targets, weights)
+
+    @classmethod
+    def from_edge_list(cls, path, directed=True, weight_typecode='d'):
+        """
+        Load a graph from a text file with one 'source target weight' edge per line.
+
+        Blank lines and lines starting with '#' are skipped. Node names are kept as strings.
+
+        Parameters:
+        path (str): The edge-list file to read.
+        directed (bool, optional): If False, every edge is also added in the reverse direction.
+        weight_typecode (str, optional): The array typecode of the weights.
+
+        Returns:
+        CSRGraph: The new graph.
+        """
+        def read_edges(file):
+            for line in file:
+                fields = line.split()
+                if fields and not fields[0].startswith('#'):
+                    yield fields[0], fields[1], float(fields[2])
+
+        with open(path) as file:
+            return cls.from_edges(read_edges(file), directed, weight_typecode)
+
+    @classmethod
+    def _from_arrays(cls, names, sources, targets, weights):
+        """
+        Sort parallel edge arrays by source into CSR form with a counting sort.
+
+        Parameters:
+        names (list): The name of each node id.
+        sources (array): The source node id of each edge.
+        targets (array): The target node id of each edge.
+        weights (array): The weight of each edge.
+
+        Returns:
+        CSRGraph: The new graph.
+        """
+        offsets = array('q', [0]) * (len(names) + 1)
+        for source in sources:
+            offsets[source + 1] += 1
+        for node_id in range(len(names)):
+            offsets[node_id + 1] += offsets[node_id]
+
+        positions = offsets[:-1]
+        sorted_targets = array('i', [0]) * len(targets)
+        sorted_weights = array(weights.typecode, [0]) * len(weights)
+        for edge, source in enumerate(sources):
+            position = positions[source]
+            sorted_targets[position] = targets[edge]
+            sorted_weights[position] = weights[edge]
+            positions[source] = position + 1
+
+        return cls(names, offsets, sorted_targets, sorted_weights)
+
+    def __len__(self):
+        return len(self.names)
+
+    def __iter__(self):
+        return iter(self.names)
+
+    def __contains__(self, name):
+        return name in self.ids
+
+    def get(self, name, default=()):
+        """
+        Return the outgoing edges of a node in the dict-of-lists format.
+
+        Parameters:
+        name: The node name.
+        default (optional): The value returned if the node is not in the graph.
+
+        Returns:
+        list: The (neighbor, distance) tuples of the node.
+        """
+        if name not in self.ids:
+            return default
+        node_id = self.ids[name]
+        start, end = self.offsets[node_id], self.offsets[node_id + 1]
+        return [(self.names[target], weight)
+                for target, weight in zip(self.targets[start:end], self.weights[start:end])]
+
+    def __getitem__(self, name):
+        if name not in self.ids:
+            raise KeyError(name)
+        return self.get(name)
+
+    def dijkstra(self, start, target=None, stop_after=None):
+        """
+        Run Dijkstra's algorithm over node ids.
+
+        Distances and predecessors are kept in arrays indexed by node id rather than dicts.
+
+        Parameters:
+        start (int): The starting node id.
+        target (int, optional): A node id at which to stop the search early.
+        stop_after (iterable, optional): Node ids; the search stops once all of them are settled.
+
+        Returns:
+        tuple: A tuple containing:
+               - settled: The settled node ids in order of increasing distance.
+               - distances: An array of distances indexed by node id, final for settled nodes.
+               - predecessors: An array with the previous node id on a shortest path (-1 if none).
+        """
+        offsets, targets, weights = self.offsets, self.targets, self.weights
+        distances = array('d', [float('inf')]) * len(self.names)
+        predecessors = array('i', [-1]) * len(self.names)
+        done = bytearray(len(self.names))
+        settled = []
+        remaining = None if stop_after is None else set(stop_after)
+        distances[start] = 0
+        heap = [(0, start)]
+
+        while heap:
+            distance, current = heapq.heappop(heap)
+            if done[current]:
+                continue
+            done[current] = 1
+            settled.append(current)
+            if current == target:
+                break
+            if remaining is not None:
+                remaining.discard(current)
+                if not remaining:
+                    break
+            for edge in range(offsets[current], offsets[current + 1]):
+                node = targets[edge]
+                new_distance = distance + weights[edge]
+                if new_distance < distances[node] and not done[node]:
+                    distances[node] = new_distance
+                    predecessors[node] = current
+                    heapq.heappush(heap, (new_distance, node))
+
+        return settled, distances, predecessors
+
+
+class ContractionHierarchy:
+    """
+    A precomputed routing index for repeated point-to-point shortest-path queries.
+
+    Preprocessing contracts the nodes one at a time, least important first
+    (fewest shortcuts added, fewest neighbors already contracted). Contracting
+    a node removes it and adds shortcut edges between its neighbors wherever
+    the node lay on the only short path between them. A query then runs a
+    bidirectional Dijkstra that only follows edges towards more important
+    nodes, which explores a tiny part of the graph.
+
+    Attributes:
+    names (list): The name of each node, indexed by node id.
+    ids (dict): The node id of each name.
+    forward (CSRGraph): The upward edges followed by the search from the start.
+    backward (CSRGraph): The reversed upward edges followed by the search from the target.
+    middles (dict): The contracted node each shortcut (source id, target id) bypasses.
+    """
+
+    # Witness searches stop after settling this many nodes. A smaller limit makes preprocessing
+    # faster at the cost of adding shortcuts that are not strictly needed.
+    WITNESS_SETTLE_LIMIT = 500
+
+    def __init__(self, names, forward, backward, middles):
+        self.names = names
+        self.ids = {name: node_id for node_id, name in enumerate(names)}
+        self.forward = forward
+        self.backward = backward
+        self.middles = middles
+
+    @classmethod
+    def build(cls, graph):
+        """
+        Preprocess a graph into a contraction hierarchy.
+
+        Parameters:
+        graph (dict or CSRGraph): A dictionary mapping each node to a list of
+                                  (neighbor, distance) tuples.
+
+        Returns:
+        ContractionHierarchy: The routing index.
+        """
+        names = list(graph)
+        ids = {name: node_id for node_id, name in enumerate(names)}
+        out_edges = [{} for _ in names]
+        in_edges = [{} for _ in names]
+        for name in list(names):
+            for neighbor, weight in graph.get(name, ()):
+                if neighbor not in ids:
+                    ids[neighbor] = len(names)
+                    names.append(neighbor)
+                    out_edges.append({})
+                    in_edges.append({})
+                source, target = ids[name], ids[neighbor]
+                if source != target and weight < out_edges[source].get(target, float('inf')):
+                    out_edges[source][target] = weight
+                    in_edges[target][source] = weight
+
+        contracted_neighbors = [0] * len(names)
+        middles = {}
+        upward = ([], [], [])
+        downward = ([], [], [])
+
+        def priority(node):
+            shortcuts = cls._shortcuts(node, out_edges, in_edges)
+            return (len(shortcuts) - len(out_edges[node]) - len(in_edges[node])
+                    + contracted_neighbors[node]), shortcuts
+
+        queue = [(priority(node)[0], node) for node in range(len(names))]
+        heapq.heapify(queue)
+        while queue:
+            _, node = heapq.heappop(queue)
+            current, shortcuts = priority(node)
+            if queue and current > queue[0][0]:
+                heapq.heappush(queue, (current, node))
+                continue
+
+            for target, weight in out_edges[node].items():
+                upward[0].append(node)
+                upward[1].append(target)
+                upward[2].append(weight)
+                del in_edges[target][node]
+                contracted_neighbors[target] += 1
+            for source, weight in in_edges[node].items():
+                downward[0].append(node)
+                downward[1].append(source)
+                downward[2].append(weight)
+                del out_edges[source][node]
+                contracted_neighbors[source] += 1
+            out_edges[node] = in_edges[node] = None
+
+            for source, target, weight in shortcuts:
+                if weight < out_edges[source].get(target, float('inf')):
+                    out_edges[source][target] = weight
+                    in_edges[target][source] = weight
+                    middles[source, target] = node
+
+        def to_csr(edges):
+            sources, targets, weights = edges
+            return CSRGraph._from_arrays(names, array('i', sources), array('i', targets),
+                                         array('d', weights))
+
+        return cls(names, to_csr(upward), to_csr(downward), middles)
+
+    @classmethod
+    def _shortcuts(cls, node, out_edges, in_edges):
+        """
+        Find the shortcuts needed to contract a node from the remaining graph.
+
+        A shortcut source -> target is needed when the path through the node is shorter than
+        every witness path found by a bounded Dijkstra from source that avoids the node.
+
+        Parameters:
+        node (int): The node id to contract.
+        out_edges (list): The remaining outgoing edges of each node id, as dicts.
+        in_edges (list): The remaining incoming edges of each node id, as dicts.
+
+        Returns:
+        list: The (source id, target id, weight) shortcuts.
+        """
+        shortcuts = []
+        for source, in_weight in in_edges[node].items():
+            candidates = {target: in_weight + out_weight
+                          for target, out_weight in out_edges[node].items() if target != source}
+            if not candidates:
+                continue
+            limit = max(candidates.values())
+
+            distances = {source: 0}
+            heap = [(0, source)]
+            settled = 0
+            while heap and settled < cls.WITNESS_SETTLE_LIMIT:
+                distance, current = heapq.heappop(heap)
+                if distance > distances[current]:
+                    continue
+                if distance > limit:
+                    break
+                settled += 1
+                for neighbor, weight in out_edges[current].items():
+                    new_distance = distance + weight
+                    if neighbor != node and new_distance < distances.get(neighbor, float('inf')):
+                        distances[neighbor] = new_distance
+                        heapq.heappush(heap, (new_distance, neighbor))
+
+            shortcuts.extend((source, target, weight) for target, weight in candidates.items()
+                             if distances.get(target, float('inf')) > weight)
+        return shortcuts
+
+    def _search(self, start, target):
+        """
+        Run the bidirectional upward search between two node ids.
+
+        Parameters:
+        start (int): The starting node id.
+        target (int): The target node id.
+
+        Returns:
+        tuple: The shortest distance, the node id where the two searches met (None if
+               unreachable), and the predecessor dicts of the forward and backward searches.
+        """
+        distances = ({start: 0}, {target: 0})
+        predecessors = ({start: None}, {target: None})
+        heaps = ([(0, start)], [(0, target)])
+        graphs = (self.forward, self.backward)
+        best, meeting = float('inf'), None
+
+        while heaps[0] or heaps[1]:
+            for side in (0, 1):
+                heap = heaps[side]
+                if not heap:
+                    continue
+                distance, current = heapq.heappop(heap)
+                if distance > distances[side][current]:
+                    continue
+                if distance >= best:
+                    heap.clear()
+                    continue
+                other = distances[1 - side].get(current)
+                if other is not None and distance + other < best:
+                    best, meeting = distance + other, current
+
+                graph = graphs[side]
+                for edge in range(graph.offsets[current], graph.offsets[current + 1]):
+                    node = graph.targets[edge]
+                    new_distance = distance + graph.weights[edge]
+                    if new_distance < distances[side].get(node, float('inf')):
+                        distances[side][node] = new_distance
+                        predecessors[side][node] = current
+                        heapq.heappush(heap, (new_distance, node))
+
+        return best, meeting, predecessors
+
+    def distance(self, start, target):
+        """
+        Return the shortest distance between two nodes.
+
+        Parameters:
+        start: The starting node.
+        target: The target node.
+
+        Returns:
+        float: The shortest distance, or infinity if the target is unreachable.
+        """
+        return self._search(self.ids[start], self.ids[target])[0]
+
+    def path(self, start, target):
+        """
+        Return the shortest distance and path between two nodes, expanding shortcuts.
+
+        Parameters:
+        start: The starting node.
+        target: The target node.
+
+        Returns:
+        tuple: The shortest distance (infinity if unreachable) and the list of nodes on the
+               path (empty if unreachable).
+        """
+        best, meeting, (forward, backward) = self._search(self.ids[start], self.ids[target])
+        if meeting is None:
+            return best, []
+
+        hops = []
+        node = meeting
+        while node is not None:
+            hops.append(node)
+            node = forward[node]
+        hops.reverse()
+        node = backward[meeting]
+        while node is not None:
+            hops.append(node)
+            node = backward[node]
+
+        path = [hops[0]]
+        for source, target in zip(hops, hops[1:]):
+            stack = [(source, target)]
+            while stack:
+                edge = stack.pop()
+                if edge in self.middles:
+                    middle = self.middles[edge]
+                    stack.append((middle, edge[1]))
+                    stack.append((edge[0], middle))
+                else:
+                    path.append(edge[1])
+        return best, [self.names[node] for node in path]
+
+    def save(self, path):
+        """
+        Write the index to a file that workers can load with ContractionHierarchy.load.
+
+        Parameters:
+        path (str): The file to write.
+        """
+        with open(path, 'wb') as file:
+            pickle.dump(self, file, protocol=pickle.HIGHEST_PROTOCOL)
+
+    @classmethod
+    def load(cls, path):
+        """
+        Read an index written by save.
+
+        Parameters:
+        path (str): The file to read.
+
+        Returns:
+        ContractionHierarchy: The routing index.
+        """
+        with open(path, 'rb') as file:
+            return pickle.load(file)
+
+
+def dijkstra(graph, start, target=None):
+    """
+    Compute shortest distances from a start node with a binary heap.
+
+    Uses heapq with lazy deletion: a node may be pushed several times and stale
+    heap entries are skipped when popped. The search stops as soon as the
+    target, if given, is settled. Nothing is printed.
+
+    Parameters:
+    graph (dict or CSRGraph): A dictionary representing the graph. Each key is a node, and the
+                              value is a list of tuples, where each tuple contains a neighboring
+                              node and the distance to it. A CSRGraph is searched over its arrays.
+    start: The starting node for the path calculation.
+    target (optional): A node at which to stop the search early.
+
+    Returns:
+    tuple: A tuple containing two dictionaries:
+           - distances: The shortest distance from the start to every settled node. With a
+                        target, only nodes at most as far as the target are included.
+           - predecessors: The previous node on a shortest path to each settled node, which
+                           reconstruct_path turns into a full path.
+    """
+    if isinstance(graph, CSRGraph):
+        target_id = graph.ids.get(target, -1) if target is not None else None
+        settled, distances, predecessors = graph.dijkstra(graph.ids[start], target_id)
+        names = graph.names
+        return ({names[node]: distances[node] for node in settled},
+                {names[node]: names[predecessors[node]] if predecessors[node] >= 0 else None
+                 for node in settled})
+
+    distances = {}
+    predecessors = {start: None}
+    tentative = {start: 0}
+    heap = [(0, start)]
+
+    while heap:
+        distance, current = heapq.heappop(heap)
+        if current in distances:
+            continue
+        distances[current] = distance
+        if current == target:
+            break
+        for node, weight in graph.get(current, ()):
+            new_distance = distance + weight
+            if node not in distances and new_distance < tentative.get(node, float('inf')):
+                tentative[node] = new_distance
+                predecessors[node] = current
+                heapq.heappush(heap, (new_distance, node))
+
+    return distances, predecessors
+
+
+def reconstruct_path(predecessors, target):
+    """
+    Follow a predecessor map back from a target node to the start.
+
+    Parameters:
+    predecessors (dict): The predecessor map returned by dijkstra.
+    target: The node to build the path to.
+
+    Returns:
+    list: The nodes on the shortest path from the start to the target, or an empty list
+          if the target was not reached.
+    """
+    if target not in predecessors:
+        return []
+    path = []
+    while target is not None:
+        path.append(target)
+        target = predecessors[target]
+    path.reverse()
+    return path
+
+
 def shortest_path(graph, start, target=''):
     """
     Find the shortest path between nodes in a weighted graph using Dijkstra's algorithm.
@@ -16,16 +596,17 @@ def shortest_path(graph, start, target=''):
     or to all other nodes in the graph. It also prints the distances and paths.
 
     Parameters:
-    graph (dict): A dictionary representing the graph. Each key is a node, and the value is a list
-                  of tuples, where each tuple contains a neighboring node and the distance to it.
+    graph (dict or CSRGraph): A dictionary representing the graph. Each key is a node, and the
+                              value is a list of tuples, where each tuple contains a neighboring
+                              node and the distance to it.
     start (str): The starting node for the path calculation.
     target (str, optional): The target node. If not provided, paths to all nodes will be calculated.
 
     Returns:
     tuple: A tuple containing two dictionaries:
-           - distances: A dictionary with nodes as keys and their shortest distances from the 
+           - distances: A dictionary with nodes as keys and their shortest distances from the
                         start as values.
-           - paths: A dictionary with nodes as keys and lists representing the shortest path 
+           - paths: A dictionary with nodes as keys and lists representing the shortest path
                     from the start to each node as values.
 
     Prints:
@@ -33,22 +614,9 @@ def shortest_path(graph, start, target=''):
     - The distance from the start node to the target node.
     - The path from the start node to the target node.
     """
-    unvisited = list(graph)
-    distances = {node: 0 if node == start else float('inf') for node in graph}
-    paths = {node: [] for node in graph}
-    paths[start].append(start)
-
-    while unvisited:
-        current = min(unvisited, key=distances.get)
-        for node, distance in graph[current]:
-            if distance + distances[current] < distances[node]:
-                distances[node] = distance + distances[current]
-                if paths[node] and paths[node][-1] == node:
-                    paths[node] = paths[current][:]
-                else:
-                    paths[node].extend(paths[current])
-                paths[node].append(node)
-        unvisited.remove(current)
+    settled, predecessors = dijkstra(graph, start)
+    distances = {node: settled.get(node, float('inf')) for node in graph}
+    paths = {node: reconstruct_path(predecessors, node) for node in graph}
 
     targets_to_print = [target] if target else graph
     for node in targets_to_print:
@@ -60,4 +628,272 @@ def shortest_path(graph, start, target=''):
     return distances, paths
 
 
-shortest_path(my_graph, 'A', 'F')
+class ShortestPathCache:
+    """
+    A bounded LRU cache of shortest-path trees around dijkstra.
+
+    The cache keeps the result of one search per start node. A query for (start, target) is
+    answered from the cached tree of start whenever that tree already covers target, so a
+    full tree answers every target and repeated pairs never search twice. Edges must be
+    edited through add_edge, remove_edge and set_weight, which drop only the cached trees the
+    edit can change; call invalidate after editing the graph dict directly.
+
+    Attributes:
+    graph (dict): The adjacency dict being searched.
+    maxsize (int): The maximum number of start nodes whose trees are kept.
+    hits (int): The number of queries answered from the cache.
+    misses (int): The number of queries that ran a search.
+    """
+
+    def __init__(self, graph, maxsize=128):
+        self.graph = graph
+        self.maxsize = maxsize
+        self.hits = 0
+        self.misses = 0
+        self._trees = OrderedDict()
+
+    def _lookup(self, start, target=None):
+        """
+        Return the cached tree of start if it covers target, searching on a miss.
+
+        Parameters:
+        start: The starting node.
+        target (optional): The node the tree must reach; without it a complete tree is needed.
+
+        Returns:
+        tuple: The distances and predecessors dicts of the tree, as returned by dijkstra.
+        """
+        tree = self._trees.get(start)
+        if tree is not None and (tree[2] or target in tree[0]):
+            self.hits += 1
+            self._trees.move_to_end(start)
+            return tree[0], tree[1]
+
+        self.misses += 1
+        distances, predecessors = dijkstra(self.graph, start, target)
+        complete = target is None or target not in distances
+        self._trees[start] = (distances, predecessors, complete)
+        self._trees.move_to_end(start)
+        if len(self._trees) > self.maxsize:
+            self._trees.popitem(last=False)
+        return distances, predecessors
+
+    def query(self, start, target):
+        """
+        Return the shortest distance and path between two nodes.
+
+        Parameters:
+        start: The starting node.
+        target: The target node.
+
+        Returns:
+        tuple: The shortest distance (infinity if unreachable) and the list of nodes on the
+               path (empty if unreachable).
+        """
+        distances, predecessors = self._lookup(start, target)
+        if target not in distances:
+            return float('inf'), []
+        return distances[target], reconstruct_path(predecessors, target)
+
+    def tree(self, start):
+        """
+        Return the full shortest-path tree of a start node.
+
+        Parameters:
+        start: The starting node.
+
+        Returns:
+        tuple: The distances and predecessors dicts, as returned by dijkstra without a target.
+        """
+        return self._lookup(start)
+
+    def add_edge(self, source, target, weight):
+        """
+        Add a directed edge to the graph. Add the reverse edge too for undirected graphs.
+
+        Parameters:
+        source: The node the edge leaves.
+        target: The node the edge enters.
+        weight (float): The distance of the edge.
+        """
+        self.graph.setdefault(source, []).append((target, weight))
+        self._edge_changed(source, target, float('inf'), weight)
+
+    def remove_edge(self, source, target):
+        """
+        Remove every directed edge from source to target.
+
+        Parameters:
+        source: The node the edge leaves.
+        target: The node the edge enters.
+        """
+        edges = self.graph.get(source, [])
+        removed = [weight for node, weight in edges if node == target]
+        if removed:
+            edges[:] = [(node, weight) for node, weight in edges if node != target]
+            self._edge_changed(source, target, min(removed), float('inf'))
+
+    def set_weight(self, source, target, weight):
+        """
+        Replace the weight of the directed edge from source to target, adding it if missing.
+
+        Parameters:
+        source: The node the edge leaves.
+        target: The node the edge enters.
+        weight (float): The new distance of the edge.
+        """
+        self.remove_edge(source, target)
+        self.add_edge(source, target, weight)
+
+    def _edge_changed(self, source, target, old_weight, new_weight):
+        """
+        Drop the cached trees whose distances an edge edit can change.
+
+        A shorter edge matters if it offers a shorter way to reach target than the tree has
+        (or than the tree's search radius, if target was not reached). A longer or removed
+        edge matters only if the tree reached target through it.
+
+        Parameters:
+        source: The node the edge leaves.
+        target: The node the edge enters.
+        old_weight (float): The previous weight, infinity if the edge was added.
+        new_weight (float): The new weight, infinity if the edge was removed.
+        """
+        stale = []
+        for start, (distances, predecessors, complete) in self._trees.items():
+            if source not in distances:
+                continue
+            if new_weight < old_weight:
+                radius = float('inf') if complete else next(reversed(distances.values()))
+                if distances[source] + new_weight < distances.get(target, radius):
+                    stale.append(start)
+            elif new_weight > old_weight:
+                if target in distances and predecessors.get(target) == source:
+                    stale.append(start)
+        for start in stale:
+            del self._trees[start]
+
+    def invalidate(self):
+        """
+        Drop every cached tree.
+        """
+        self._trees.clear()
+
+    def cache_info(self):
+        """
+        Report the cache statistics.
+
+        Returns:
+        dict: The hits, misses, maxsize and current number of cached trees.
+        """
+        return {'hits': self.hits, 'misses': self.misses,
+                'maxsize': self.maxsize, 'currsize': len(self._trees)}
+
+
+# The graph and target ids shared by distance_matrix worker processes, set once per worker by
+# _init_distance_worker.
+_worker_graph = None
+_worker_targets = None
+
+
+def _init_distance_worker(graph, targets):
+    """
+    Store the shared graph and target ids in a distance_matrix worker process.
+
+    Parameters:
+    graph (CSRGraph): The graph to search.
+    targets (array): The target node ids, in output column order.
+    """
+    global _worker_graph, _worker_targets
+    _worker_graph = graph
+    _worker_targets = targets
+
+
+def _distance_row(source):
+    """
+    Compute one row of the distance matrix in a worker process.
+
+    Parameters:
+    source (int): The source node id.
+
+    Returns:
+    array: The distances from the source to each target, infinity if unreachable.
+    """
+    _, distances, _ = _worker_graph.dijkstra(source, stop_after=_worker_targets)
+    return array('d', (distances[target] for target in _worker_targets))
+
+
+def distance_matrix(graph, sources, targets, workers=None, chunksize=1):
+    """
+    Compute the shortest distances from every source to every target on a process pool.
+
+    Each worker runs one Dijkstra per source over a shared CSRGraph, stopping as soon as every
+    target is settled. The graph is sent to each worker once when the pool starts (on
+    fork-based platforms it is inherited without copying) and is only read afterwards. The
+    rows are written into one preallocated buffer as they arrive. Nothing is printed.
+
+    Parameters:
+    graph (dict or CSRGraph): A dictionary mapping each node to a list of
+                              (neighbor, distance) tuples, converted to a CSRGraph if needed.
+    sources (list): The origin nodes, one row each.
+    targets (list): The destination nodes, one column each.
+    workers (int, optional): The number of worker processes, defaulting to the number of CPUs.
+                             With 1, the rows are computed in the calling process.
+    chunksize (int, optional): The number of sources sent to a worker at once.
+
+    Returns:
+    tuple: A tuple containing:
+           - matrix: One contiguous array('d') of the distances in row-major order, so the
+                     distance from sources[i] to targets[j] is matrix[i * len(targets) + j]
+                     (infinity if unreachable).
+           - shape: The (len(sources), len(targets)) dimensions of the matrix.
+    """
+    if not isinstance(graph, CSRGraph):
+        graph = CSRGraph.from_dict(graph)
+    source_ids = [graph.ids[source] for source in sources]
+    target_ids = array('i', (graph.ids[target] for target in targets))
+    workers = workers or os.cpu_count()
+    columns = len(target_ids)
+    matrix = array('d', bytes(8 * len(source_ids) * columns))
+
+    if workers == 1:
+        _init_distance_worker(graph, target_ids)
+        for index, row in enumerate(map(_distance_row, source_ids)):
+            matrix[index * columns:(index + 1) * columns] = row
+    else:
+        with ProcessPoolExecutor(max_workers=workers, initializer=_init_distance_worker,
+                                 initargs=(graph, target_ids)) as executor:
+            rows = executor.map(_distance_row, source_ids, chunksize=chunksize)
+            for index, row in enumerate(rows):
+                matrix[index * columns:(index + 1) * columns] = row
+    return matrix, (len(source_ids), columns)
+
+
+def benchmark_distance_matrix(graph, sources, targets, worker_counts=(1, 2, 4, 8)):
+    """
+    Time distance_matrix for several worker counts and print the speedup.
+
+    Parameters:
+    graph (dict or CSRGraph): The graph to search.
+    sources (list): The origin nodes.
+    targets (list): The destination nodes.
+    worker_counts (tuple, optional): The pool sizes to compare.
+
+    Returns:
+    dict: The elapsed seconds, keyed by worker count.
+    """
+    if not isinstance(graph, CSRGraph):
+        graph = CSRGraph.from_dict(graph)
+
+    results = {}
+    for workers in worker_counts:
+        start = time.perf_counter()
+        distance_matrix(graph, sources, targets, workers)
+        results[workers] = time.perf_counter() - start
+        speedup = results[worker_counts[0]] / results[workers]
+        print(f'{workers:>3} workers: {results[workers]:.2f} s ({speedup:.2f}x)')
+    return results
+
+
+if __name__ == '__main__':
+    shortest_path(my_graph, 'A', 'F')
@@ -8,11 +8,29 @@ Classes:
 Board
     A class to represent a Sudoku board and provide methods to solve it.
 
+BitmaskBoard
+    A Board solved by bitmask constraint propagation instead of plain backtracking.
+
+DancingLinksBoard
+    An N²xN² board solved as an exact-cover problem with Dancing Links.
+
 Functions:
 ----------
-solve_sudoku(board)
+solve_sudoku(board, engine='backtracking')
     Solve the given Sudoku puzzle and print the result.
 
+parse_puzzle(line), format_puzzle(board)
+    Convert between 81-character puzzle lines and 9x9 grids.
+
+solve_batch(puzzles, engine='bitmask', workers=None, chunksize=256)
+    Solve a stream of puzzle lines on a process pool, yielding results in order.
+
+benchmark_batch(puzzles, worker_counts=(1, 2, 4, 8))
+    Report batch throughput in puzzles/sec for several pool sizes.
+
+benchmark_engines(puzzles=HARD_PUZZLES)
+    Compare the solve time of each engine on a set of hard puzzles.
+
 Example usage:
 --------------
 board = [
@@ -26,9 +44,19 @@ board = [
     [0, 0, 0, 4, 1, 9, 0, 0, 5],
     [0, 0, 0, 0, 8, 0, 0, 7, 9]
 ]
-solve_sudoku(board)
+solve_sudoku(board, engine='bitmask')
+
+for solution in solve_batch('puzzles.txt'):
+    print(solution)
 """
 
+import math
+import os
+import time
+from collections import deque
+from concurrent.futures import ProcessPoolExecutor
+from itertools import islice
+
 
 class Board:
     """
@@ -189,7 +217,458 @@ class Board:
         return False
 
 
-def solve_sudoku(board):
+# The row, column and box unit indices (0-8, 9-17, 18-26) of each of the 81
+# cells, and the cells belonging to each unit.
+CELL_UNITS = [(cell // 9, 9 + cell % 9, 18 + cell // 27 * 3 + cell % 9 // 3)
+              for cell in range(81)]
+UNITS = [[cell for cell in range(81) if unit in CELL_UNITS[cell]]
+         for unit in range(27)]
+
+
+class BitmaskBoard(Board):
+    """
+    A Sudoku board solved by constraint propagation over candidate bitmasks.
+
+    Each row, column and 3x3 box keeps a bitmask of the digits already placed
+    in it (bit d - 1 for digit d), updated incrementally as cells are filled
+    and undone on backtrack. The candidates of a cell are the digits missing
+    from all three masks. Before each guess, naked singles (cells with one
+    candidate) and hidden singles (digits with one possible cell in a unit)
+    are filled in, and the search branches on the cell with the fewest
+    candidates.
+    """
+
+    ALL_DIGITS = 0x1FF
+    CELL_UNITS = CELL_UNITS
+    UNITS = UNITS
+    POPCOUNT = [bin(mask).count('1') for mask in range(512)]
+
+    def solver(self):
+        """
+        Solve the Sudoku puzzle using bitmask constraint propagation.
+
+        Returns:
+        --------
+        bool
+            True if the puzzle is solved, False if it is unsolvable.
+        """
+        self._cells = [value for row in self.board for value in row]
+        self._used = [0] * 27
+        self._trail = []
+        self._empty = set()
+        for cell, value in enumerate(self._cells):
+            if value == 0:
+                self._empty.add(cell)
+                continue
+            bit = 1 << (value - 1)
+            units = self.CELL_UNITS[cell]
+            if any(self._used[unit] & bit for unit in units):
+                return False
+            for unit in units:
+                self._used[unit] |= bit
+
+        if not self._search():
+            return False
+        for row in range(9):
+            self.board[row][:] = self._cells[row * 9:row * 9 + 9]
+        return True
+
+    def _candidates(self, cell):
+        """
+        Return the bitmask of digits that can still go in a cell.
+
+        Parameters:
+        -----------
+        cell : int
+            The cell index, row * 9 + col.
+
+        Returns:
+        --------
+        int
+            The candidate bitmask.
+        """
+        row, col, box = self.CELL_UNITS[cell]
+        used = self._used
+        return self.ALL_DIGITS & ~(used[row] | used[col] | used[box])
+
+    def _place(self, cell, bit):
+        """
+        Fill a cell with the digit of a bit and record it on the trail.
+
+        Parameters:
+        -----------
+        cell : int
+            The cell index.
+        bit : int
+            The single-bit mask of the digit.
+
+        Returns:
+        --------
+        bool
+            False if the digit is no longer a candidate for the cell.
+        """
+        if not self._candidates(cell) & bit:
+            return False
+        for unit in self.CELL_UNITS[cell]:
+            self._used[unit] |= bit
+        self._cells[cell] = bit.bit_length()
+        self._empty.discard(cell)
+        self._trail.append(cell)
+        return True
+
+    def _undo(self, trail_length):
+        """
+        Clear every cell placed since the trail had the given length.
+
+        Parameters:
+        -----------
+        trail_length : int
+            The trail length to roll back to.
+        """
+        while len(self._trail) > trail_length:
+            cell = self._trail.pop()
+            clear = ~(1 << (self._cells[cell] - 1))
+            for unit in self.CELL_UNITS[cell]:
+                self._used[unit] &= clear
+            self._cells[cell] = 0
+            self._empty.add(cell)
+
+    def _propagate(self):
+        """
+        Fill naked and hidden singles until none are left.
+
+        Returns:
+        --------
+        bool
+            False if a contradiction was found.
+        """
+        changed = True
+        while changed:
+            changed = False
+            for cell in list(self._empty):
+                if cell not in self._empty:
+                    continue
+                candidates = self._candidates(cell)
+                if not candidates:
+                    return False
+                if candidates & (candidates - 1) == 0:
+                    if not self._place(cell, candidates):
+                        return False
+                    changed = True
+
+            for unit, cells in enumerate(self.UNITS):
+                once = twice = 0
+                for cell in cells:
+                    if self._cells[cell] == 0:
+                        candidates = self._candidates(cell)
+                        twice |= once & candidates
+                        once |= candidates
+                if once | self._used[unit] != self.ALL_DIGITS:
+                    return False
+                singles = once & ~twice
+                while singles:
+                    bit = singles & -singles
+                    singles ^= bit
+                    for cell in cells:
+                        if self._cells[cell] == 0 and self._candidates(cell) & bit:
+                            if not self._place(cell, bit):
+                                return False
+                            changed = True
+                            break
+        return True
+
+    def _search(self):
+        """
+        Propagate, then branch on the most constrained empty cell.
+
+        Returns:
+        --------
+        bool
+            True if the board was completed, False if this branch fails. On
+            failure every cell filled in this call has been cleared again.
+        """
+        trail_length = len(self._trail)
+        if not self._propagate():
+            self._undo(trail_length)
+            return False
+        if not self._empty:
+            return True
+
+        cell = min(self._empty, key=lambda i: self.POPCOUNT[self._candidates(i)])
+        candidates = self._candidates(cell)
+        while candidates:
+            bit = candidates & -candidates
+            candidates ^= bit
+            guess_length = len(self._trail)
+            self._place(cell, bit)
+            if self._search():
+                return True
+            self._undo(guess_length)
+        self._undo(trail_length)
+        return False
+
+
+class DancingLinksBoard(Board):
+    """
+    A Sudoku board of any N²xN² size solved as an exact-cover problem.
+
+    Each way of putting digit d in cell (row, col) is a row of the exact-cover
+    matrix, covering four constraint columns: the cell is filled, and the row,
+    column and box each contain d. Knuth's Algorithm X searches this matrix,
+    stored as Dancing Links: circular doubly linked lists kept in flat
+    integer lists, where removing and restoring a node are O(1) link updates.
+
+    Attributes:
+    -----------
+    board : list of list of int
+        An N²xN² grid (9x9, 16x16, 25x25, ...), where 0 represents an empty cell.
+    """
+
+    def solver(self):
+        """
+        Solve the puzzle using Dancing Links.
+
+        Returns:
+        --------
+        bool
+            True if the puzzle is solved, False if it is unsolvable.
+        """
+        solution = self._search(1)
+        if solution is None:
+            return False
+        for row, col, digit in solution:
+            self.board[row][col] = digit
+        return True
+
+    def count_solutions(self, limit=None):
+        """
+        Count the solutions of the puzzle without modifying the board.
+
+        Parameters:
+        -----------
+        limit : int or None
+            Stop once this many solutions are found, or count them all if None.
+
+        Returns:
+        --------
+        int
+            The number of solutions found, at most limit.
+        """
+        self._count = 0
+        self._search(limit)
+        return self._count
+
+    def has_unique_solution(self):
+        """
+        Check whether the puzzle has exactly one solution.
+
+        The search stops as soon as a second solution is found.
+
+        Returns:
+        --------
+        bool
+            True if the puzzle has exactly one solution.
+        """
+        return self.count_solutions(limit=2) == 1
+
+    def _search(self, limit):
+        """
+        Build the Dancing Links matrix for the board and run Algorithm X.
+
+        Parameters:
+        -----------
+        limit : int or None
+            Stop once this many solutions are found, or search exhaustively.
+
+        Returns:
+        --------
+        list of tuple of int or None
+            The (row, col, digit) placements of the first solution found, or
+            None if the puzzle is unsolvable. The number of solutions found
+            is stored in self._count.
+
+        Raises:
+        -------
+        ValueError
+            If the board is not an N²xN² grid of digits 0..N².
+        """
+        size = len(self.board)
+        box = math.isqrt(size)
+        if box * box != size or any(len(row) != size for row in self.board):
+            raise ValueError('board must be an N²xN² grid')
+        if any(not 0 <= value <= size for row in self.board for value in row):
+            raise ValueError(f'cell values must be between 0 and {size}')
+
+        self._count = 0
+        cells = size * size
+        givens = set()
+        for row, contents in enumerate(self.board):
+            for col, digit in enumerate(contents):
+                if digit:
+                    constraints = self._constraints(size, box, row, col, digit)
+                    if givens.intersection(constraints[1:]):
+                        return None
+                    givens.update(constraints[1:])
+
+        # Node 0 is the root header and nodes 1..4 * cells are column headers.
+        columns = 4 * cells
+        left = list(range(-1, columns))
+        left[0] = columns
+        right = list(range(1, columns + 2))
+        right[columns] = 0
+        up = list(range(columns + 1))
+        down = list(range(columns + 1))
+        column_of = list(range(columns + 1))
+        sizes = [0] * (columns + 1)
+        options = [None] * (columns + 1)
+
+        preset = []
+        for row, contents in enumerate(self.board):
+            for col, given in enumerate(contents):
+                for digit in range(1, size + 1) if not given else (given,):
+                    constraints = self._constraints(size, box, row, col, digit)
+                    if not given and givens.intersection(constraints[1:]):
+                        continue
+                    first = len(left)
+                    for offset, column in enumerate(constraints):
+                        node = first + offset
+                        column += 1
+                        left.append(first + (offset - 1) % 4)
+                        right.append(first + (offset + 1) % 4)
+                        up.append(up[column])
+                        down.append(column)
+                        down[up[column]] = node
+                        up[column] = node
+                        column_of.append(column)
+                        sizes[column] += 1
+                        options.append((row, col, digit))
+                    if given:
+                        preset.append(first)
+
+        def cover(column):
+            right[left[column]] = right[column]
+            left[right[column]] = left[column]
+            node = down[column]
+            while node != column:
+                other = right[node]
+                while other != node:
+                    up[down[other]] = up[other]
+                    down[up[other]] = down[other]
+                    sizes[column_of[other]] -= 1
+                    other = right[other]
+                node = down[node]
+
+        def uncover(column):
+            node = up[column]
+            while node != column:
+                other = left[node]
+                while other != node:
+                    sizes[column_of[other]] += 1
+                    up[down[other]] = other
+                    down[up[other]] = other
+                    other = left[other]
+                node = up[node]
+            right[left[column]] = column
+            left[right[column]] = column
+
+        for first in preset:
+            node = first
+            while True:
+                cover(column_of[node])
+                node = right[node]
+                if node == first:
+                    break
+
+        chosen = []
+        found = []
+
+        def search():
+            if right[0] == 0:
+                self._count += 1
+                if self._count == 1:
+                    found.extend(options[node] for node in chosen)
+                return limit is not None and self._count >= limit
+
+            column = best = right[0]
+            fewest = sizes[column]
+            while column != 0 and fewest > 1:
+                if sizes[column] < fewest:
+                    best, fewest = column, sizes[column]
+                column = right[column]
+            if fewest == 0:
+                return False
+
+            cover(best)
+            node = down[best]
+            while node != best:
+                chosen.append(node)
+                other = right[node]
+                while other != node:
+                    cover(column_of[other])
+                    other = right[other]
+                if search():
+                    return True
+                other = left[node]
+                while other != node:
+                    uncover(column_of[other])
+                    other = left[other]
+                chosen.pop()
+                node = down[node]
+            uncover(best)
+            return False
+
+        search()
+        return found if self._count else None
+
+    @staticmethod
+    def _constraints(size, box, row, col, digit):
+        """
+        Return the exact-cover columns satisfied by placing digit at (row, col).
+
+        Parameters:
+        -----------
+        size : int
+            The side length N² of the grid.
+        box : int
+            The side length N of a box.
+        row : int
+            The row index.
+        col : int
+            The column index.
+        digit : int
+            The digit placed, between 1 and size.
+
+        Returns:
+        --------
+        tuple of int
+            The zero-based cell, row-digit, column-digit and box-digit columns.
+        """
+        cells = size * size
+        block = row // box * box + col // box
+        value = digit - 1
+        return (row * size + col,
+                cells + row * size + value,
+                2 * cells + col * size + value,
+                3 * cells + block * size + value)
+
+
+ENGINES = {
+    'backtracking': Board,
+    'bitmask': BitmaskBoard,
+    'dlx': DancingLinksBoard,
+}
+
+# Well-known 9x9 puzzles that are hard for naive backtracking: Arto Inkala's
+# 2012 puzzle and three from Peter Norvig's hardest-puzzle list.
+HARD_PUZZLES = [
+    '8..........36......7..9.2...5...7.......457.....1...3...1....68..85...1..9....4..',
+    '4.....8.5.3..........7......2.....6.....8.4......1.......6.3.7.5..2.....1.4......',
+    '85...24..72......9..4.........1.7..23.5...9...4...........8..7..17..........36.4.',
+    '..53.....8......2..7..1.5..4....53...1..7...6..32...8..6.5....9..4....3......97..',
+]
+
+
+def solve_sudoku(board, engine='backtracking'):
     """
     Solve the given Sudoku puzzle and print the result.
 
@@ -197,13 +676,15 @@ def solve_sudoku(board):
     -----------
     board : list of list of int
         A 9x9 grid representing the Sudoku board, where 0 represents an empty cell.
+    engine : str
+        The solver to use, one of the keys of ENGINES.
 
     Returns:
     --------
     Board
         The Board object representing the solved puzzle, or the unsolvable state.
     """
-    gameboard = Board(board)
+    gameboard = ENGINES[engine](board)
     print(f'Puzzle to solve:\n{gameboard}')
     if gameboard.solver():
         print(f'Solved puzzle:\n{gameboard}')
@@ -212,15 +693,208 @@ def solve_sudoku(board):
     return gameboard
 
 
-puzzle = [
-    [0, 0, 2, 0, 0, 8, 0, 0, 0],
-    [0, 0, 0, 0, 0, 3, 7, 6, 2],
-    [4, 3, 0, 0, 0, 0, 8, 0, 0],
-    [0, 5, 0, 0, 3, 0, 0, 9, 0],
-    [0, 4, 0, 0, 0, 0, 0, 2, 6],
-    [0, 0, 0, 4, 6, 7, 0, 0, 0],
-    [0, 8, 6, 7, 0, 4, 0, 0, 0],
-    [0, 0, 0, 5, 1, 9, 0, 0, 8],
-    [1, 7, 0, 0, 0, 6, 0, 0, 5]
-]
-solve_sudoku(puzzle)
+def parse_puzzle(line):
+    """
+    Convert an 81-character puzzle line into a 9x9 grid.
+
+    Parameters:
+    -----------
+    line : str
+        The cells in row-major order, with '0' or '.' for empty cells.
+
+    Returns:
+    --------
+    list of list of int
+        A 9x9 grid where 0 represents an empty cell.
+
+    Raises:
+    -------
+    ValueError
+        If the line is not 81 digits or dots.
+    """
+    line = line.strip()
+    if len(line) != 81 or any(ch not in '.0123456789' for ch in line):
+        raise ValueError(f'invalid puzzle line: {line!r}')
+    cells = [0 if ch == '.' else int(ch) for ch in line]
+    return [cells[row * 9:row * 9 + 9] for row in range(9)]
+
+
+def format_puzzle(board):
+    """
+    Convert a 9x9 grid into an 81-character puzzle line.
+
+    Parameters:
+    -----------
+    board : list of list of int
+        A 9x9 grid where 0 represents an empty cell.
+
+    Returns:
+    --------
+    str
+        The cells in row-major order, with '0' for empty cells.
+    """
+    return ''.join(str(value) for row in board for value in row)
+
+
+def read_puzzles(path):
+    """
+    Lazily read puzzle lines from a file, skipping blank lines.
+
+    Parameters:
+    -----------
+    path : str or os.PathLike
+        A file with one 81-character puzzle per line.
+
+    Yields:
+    -------
+    str
+        The next puzzle line.
+    """
+    with open(path) as file:
+        for line in file:
+            line = line.strip()
+            if line:
+                yield line
+
+
+def _solve_chunk(lines, engine):
+    """
+    Solve a chunk of puzzle lines in a worker process.
+
+    Parameters:
+    -----------
+    lines : list of str
+        The puzzles to solve.
+    engine : str
+        The solver to use, one of the keys of ENGINES.
+
+    Returns:
+    --------
+    list of str or None
+        The solved puzzle lines, with None for unsolvable puzzles.
+    """
+    results = []
+    for line in lines:
+        gameboard = ENGINES[engine](parse_puzzle(line))
+        results.append(format_puzzle(gameboard.board) if gameboard.solver() else None)
+    return results
+
+
+def solve_batch(puzzles, engine='bitmask', workers=None, chunksize=256):
+    """
+    Solve a stream of puzzles on a process pool, yielding results in input order.
+
+    Puzzles are sent to the workers in chunks, and only a few chunks per
+    worker are in flight at a time, so arbitrarily large inputs are streamed
+    with bounded memory. Nothing is printed.
+
+    Parameters:
+    -----------
+    puzzles : str, os.PathLike or iterable of str
+        A file of puzzle lines, or the puzzle lines themselves.
+    engine : str
+        The solver to use, one of the keys of ENGINES.
+    workers : int or None
+        The number of worker processes, defaulting to the number of CPUs.
+    chunksize : int
+        The number of puzzles sent to a worker at once.
+
+    Yields:
+    -------
+    str or None
+        The solved puzzle line, or None if the puzzle is unsolvable.
+    """
+    if isinstance(puzzles, (str, os.PathLike)):
+        puzzles = read_puzzles(puzzles)
+    puzzles = iter(puzzles)
+    workers = workers or os.cpu_count()
+
+    with ProcessPoolExecutor(max_workers=workers) as executor:
+        pending = deque()
+        while True:
+            while len(pending) < 2 * workers:
+                chunk = list(islice(puzzles, chunksize))
+                if not chunk:
+                    break
+                pending.append(executor.submit(_solve_chunk, chunk, engine))
+            if not pending:
+                return
+            yield from pending.popleft().result()
+
+
+def benchmark_batch(puzzles, worker_counts=(1, 2, 4, 8), engine='bitmask', chunksize=256):
+    """
+    Measure batch throughput for several worker counts.
+
+    Parameters:
+    -----------
+    puzzles : str, os.PathLike or list of str
+        A file of puzzle lines, or the puzzle lines themselves.
+    worker_counts : iterable of int
+        The pool sizes to compare.
+    engine : str
+        The solver to use, one of the keys of ENGINES.
+    chunksize : int
+        The number of puzzles sent to a worker at once.
+
+    Returns:
+    --------
+    dict
+        The puzzles solved per second, keyed by worker count.
+    """
+    if isinstance(puzzles, (str, os.PathLike)):
+        puzzles = list(read_puzzles(puzzles))
+
+    results = {}
+    for workers in worker_counts:
+        start = time.perf_counter()
+        solved = sum(1 for _ in solve_batch(puzzles, engine, workers, chunksize))
+        results[workers] = solved / (time.perf_counter() - start)
+        speedup = results[workers] / results[worker_counts[0]]
+        print(f'{workers:>3} workers: {results[workers]:,.0f} puzzles/sec ({speedup:.2f}x)')
+    return results
+
+
+def benchmark_engines(puzzles=HARD_PUZZLES, engines=tuple(ENGINES)):
+    """
+    Compare the solve time of each engine on the same puzzles.
+
+    The plain backtracking engine can take minutes on some of HARD_PUZZLES;
+    leave it out of engines for a quick comparison.
+
+    Parameters:
+    -----------
+    puzzles : iterable of str
+        The 81-character puzzle lines to solve.
+    engines : iterable of str
+        The engines to compare, keys of ENGINES.
+
+    Returns:
+    --------
+    dict
+        The mean solve time in milliseconds per puzzle, keyed by engine.
+    """
+    puzzles = list(puzzles)
+    results = {}
+    for engine in engines:
+        start = time.perf_counter()
+        for line in puzzles:
+            ENGINES[engine](parse_puzzle(line)).solver()
+        results[engine] = (time.perf_counter() - start) / len(puzzles) * 1000
+        print(f'{engine:>12}: {results[engine]:10.2f} ms/puzzle')
+    return results
+
+
+if __name__ == '__main__':
+    puzzle = [
+        [0, 0, 2, 0, 0, 8, 0, 0, 0],
+        [0, 0, 0, 0, 0, 3, 7, 6, 2],
+        [4, 3, 0, 0, 0, 0, 8, 0, 0],
+        [0, 5, 0, 0, 3, 0, 0, 9, 0],
+        [0, 4, 0, 0, 0, 0, 0, 2, 6],
+        [0, 0, 0, 4, 6, 7, 0, 0, 0],
+        [0, 8, 6, 7, 0, 4, 0, 0, 0],
+        [0, 0, 0, 5, 1, 9, 0, 0, 8],
+        [1, 7, 0, 0, 0, 6, 0, 0, 5]
+    ]
+    solve_sudoku(puzzle)
@@ -1,3 +1,16 @@
+import heapq
+import random
+import sys
+import time
+import timeit
+from array import array
+
+try:
+    import numpy as np
+except ImportError:
+    np = None
+
+
 class R2Vector:
     def __init__(self, *, x, y):
         self.x = x
@@ -77,6 +90,483 @@ class R3Vector(R2Vector):
         return self.__class__(**kwargs)
 
 
+class CompactR2Vector:
+    """
+    A 2D vector with the same API as R2Vector, stored in __slots__.
+
+    Operators work on the two components directly instead of iterating
+    vars(self), and norm() is cached until a component is reassigned.
+    """
+
+    __slots__ = ('_x', '_y', '_norm')
+
+    def __init__(self, *, x, y):
+        self._x = x
+        self._y = y
+        self._norm = None
+
+    @property
+    def x(self):
+        return self._x
+
+    @x.setter
+    def x(self, value):
+        self._x = value
+        self._norm = None
+
+    @property
+    def y(self):
+        return self._y
+
+    @y.setter
+    def y(self, value):
+        self._y = value
+        self._norm = None
+
+    def norm(self):
+        if self._norm is None:
+            self._norm = (self._x * self._x + self._y * self._y)**0.5
+        return self._norm
+
+    def __str__(self):
+        return str((self._x, self._y))
+
+    def __repr__(self):
+        return f'{self.__class__.__name__}(x={self._x}, y={self._y})'
+
+    def __add__(self, other):
+        if type(self) != type(other):
+            return NotImplemented
+        return self.__class__(x=self._x + other._x, y=self._y + other._y)
+
+    def __sub__(self, other):
+        if type(self) != type(other):
+            return NotImplemented
+        return self.__class__(x=self._x - other._x, y=self._y - other._y)
+
+    def __mul__(self, other):
+        if type(other) in (int, float):
+            return self.__class__(x=self._x * other, y=self._y * other)
+        elif type(self) == type(other):
+            return self._x * other._x + self._y * other._y
+        return NotImplemented
+
+    def __eq__(self, other):
+        if type(self) != type(other):
+            return NotImplemented
+        return self._x == other._x and self._y == other._y
+
+    def __ne__(self, other):
+        return not self == other
+
+    def __lt__(self, other):
+        if type(self) != type(other):
+            return NotImplemented
+        return self.norm() < other.norm()
+
+    def __gt__(self, other):
+        if type(self) != type(other):
+            return NotImplemented
+        return self.norm() > other.norm()
+
+    def __le__(self, other):
+        return not self > other
+
+    def __ge__(self, other):
+        return not self < other
+
+
+class CompactR3Vector(CompactR2Vector):
+    """A 3D vector with the same API as R3Vector, stored in __slots__."""
+
+    __slots__ = ('_z',)
+
+    def __init__(self, *, x, y, z):
+        self._x = x
+        self._y = y
+        self._z = z
+        self._norm = None
+
+    @property
+    def z(self):
+        return self._z
+
+    @z.setter
+    def z(self, value):
+        self._z = value
+        self._norm = None
+
+    def norm(self):
+        if self._norm is None:
+            self._norm = (self._x * self._x + self._y * self._y + self._z * self._z)**0.5
+        return self._norm
+
+    def __str__(self):
+        return str((self._x, self._y, self._z))
+
+    def __repr__(self):
+        return f'{self.__class__.__name__}(x={self._x}, y={self._y}, z={self._z})'
+
+    def __add__(self, other):
+        if type(self) != type(other):
+            return NotImplemented
+        return self.__class__(x=self._x + other._x, y=self._y + other._y, z=self._z + other._z)
+
+    def __sub__(self, other):
+        if type(self) != type(other):
+            return NotImplemented
+        return self.__class__(x=self._x - other._x, y=self._y - other._y, z=self._z - other._z)
+
+    def __mul__(self, other):
+        if type(other) in (int, float):
+            return self.__class__(x=self._x * other, y=self._y * other, z=self._z * other)
+        elif type(self) == type(other):
+            return self._x * other._x + self._y * other._y + self._z * other._z
+        return NotImplemented
+
+    def __eq__(self, other):
+        if type(self) != type(other):
+            return NotImplemented
+        return self._x == other._x and self._y == other._y and self._z == other._z
+
+    def cross(self, other):
+        if type(self) != type(other):
+            return NotImplemented
+        return self.__class__(x=self._y * other._z - self._z * other._y,
+                              y=self._z * other._x - self._x * other._z,
+                              z=self._x * other._y - self._y * other._x)
+
+
+def benchmark_vectors(repeats=100_000):
+    """Print ops/sec for each operator and bytes per vector, R2/R3Vector against the compact classes."""
+    for plain, compact in ((R2Vector, CompactR2Vector), (R3Vector, CompactR3Vector)):
+        for vector_class in (plain, compact):
+            axes = ('x', 'y', 'z') if issubclass(vector_class, (R3Vector, CompactR3Vector)) else ('x', 'y')
+            a = vector_class(**{axis: 1.5 for axis in axes})
+            b = vector_class(**{axis: 2.5 for axis in axes})
+            size = sys.getsizeof(a)
+            if hasattr(a, '__dict__'):
+                size += sys.getsizeof(a.__dict__)
+            timings = {
+                'add': timeit.timeit(lambda: a + b, number=repeats),
+                'dot': timeit.timeit(lambda: a * b, number=repeats),
+                'scale': timeit.timeit(lambda: a * 2.0, number=repeats),
+                'norm': timeit.timeit(a.norm, number=repeats),
+                'lt': timeit.timeit(lambda: a < b, number=repeats),
+            }
+            rates = ', '.join(f'{name} {repeats / seconds:,.0f}/s' for name, seconds in timings.items())
+            print(f'{vector_class.__name__:>15}: {size} bytes/vector; {rates}')
+
+
+class VectorBatch:
+    """
+    N vectors of the same dimension stored as one NumPy array per component.
+
+    components has shape (dimension, N), so each of x, y (and z) is a
+    contiguous array and every operator runs over all N vectors at once.
+    Arithmetic and comparisons mirror R2Vector/R3Vector, returning a new
+    VectorBatch or an array with one result per vector; the other operand
+    may be a batch of the same size or a single vector, plain or compact,
+    which is broadcast.
+    """
+
+    AXES = ('x', 'y', 'z')
+    VECTOR_CLASSES = {2: R2Vector, 3: R3Vector}
+
+    def __init__(self, components):
+        if np is None:
+            raise ImportError('VectorBatch requires numpy')
+        components = np.asarray(components, dtype=float)
+        if components.ndim != 2 or components.shape[0] not in self.VECTOR_CLASSES:
+            raise ValueError('components must have shape (2, N) or (3, N)')
+        self.components = components
+
+    @classmethod
+    def from_vectors(cls, vectors):
+        vectors = list(vectors)
+        if not vectors:
+            raise ValueError('cannot build a VectorBatch from no vectors')
+        dimension = 3 if hasattr(vectors[0], 'z') else 2
+        axes = cls.AXES[:dimension]
+        return cls([[getattr(vector, axis) for vector in vectors] for axis in axes])
+
+    def to_vectors(self):
+        vector_class = self.VECTOR_CLASSES[self.dimension]
+        axes = self.AXES[:self.dimension]
+        return [vector_class(**dict(zip(axes, values))) for values in self.components.T.tolist()]
+
+    @property
+    def dimension(self):
+        return self.components.shape[0]
+
+    def __len__(self):
+        return self.components.shape[1]
+
+    def __getitem__(self, index):
+        axes = self.AXES[:self.dimension]
+        values = self.components[:, index].tolist()
+        return self.VECTOR_CLASSES[self.dimension](**dict(zip(axes, values)))
+
+    def __repr__(self):
+        return f'{self.__class__.__name__}(dimension={self.dimension}, size={len(self)})'
+
+    @staticmethod
+    def _vector_dimension(other):
+        if not (hasattr(other, 'x') and hasattr(other, 'y')):
+            return None
+        return 3 if hasattr(other, 'z') else 2
+
+    def _operand(self, other):
+        if isinstance(other, VectorBatch):
+            if other.dimension != self.dimension:
+                return None
+            return other.components
+        if self._vector_dimension(other) == self.dimension:
+            return np.array([[getattr(other, axis)] for axis in self.AXES[:self.dimension]])
+        return None
+
+    def __add__(self, other):
+        operand = self._operand(other)
+        if operand is None:
+            return NotImplemented
+        return VectorBatch(self.components + operand)
+
+    __radd__ = __add__
+
+    def __sub__(self, other):
+        operand = self._operand(other)
+        if operand is None:
+            return NotImplemented
+        return VectorBatch(self.components - operand)
+
+    def __rsub__(self, other):
+        operand = self._operand(other)
+        if operand is None:
+            return NotImplemented
+        return VectorBatch(operand - self.components)
+
+    def __mul__(self, other):
+        if type(other) in (int, float):
+            return VectorBatch(self.components * other)
+        if isinstance(other, np.ndarray) and other.ndim == 1:
+            return VectorBatch(self.components * other)
+        return self.dot(other)
+
+    def __rmul__(self, other):
+        return self * other
+
+    def dot(self, other):
+        operand = self._operand(other)
+        if operand is None:
+            return NotImplemented
+        return (self.components * operand).sum(axis=0)
+
+    def cross(self, other):
+        operand = self._operand(other)
+        if operand is None or self.dimension != 3:
+            return NotImplemented
+        return VectorBatch(np.cross(self.components, operand, axis=0))
+
+    def norm(self):
+        return np.sqrt((self.components ** 2).sum(axis=0))
+
+    def sum(self):
+        totals = self.components.sum(axis=1).tolist()
+        return self.VECTOR_CLASSES[self.dimension](**dict(zip(self.AXES, totals)))
+
+    def __eq__(self, other):
+        operand = self._operand(other)
+        if operand is None:
+            return NotImplemented
+        return (self.components == operand).all(axis=0)
+
+    def __ne__(self, other):
+        equal = self == other
+        if equal is NotImplemented:
+            return NotImplemented
+        return ~equal
+
+    def _norm_of(self, other):
+        if isinstance(other, VectorBatch) and other.dimension == self.dimension:
+            return other.norm()
+        if self._vector_dimension(other) == self.dimension:
+            return other.norm()
+        return None
+
+    def __lt__(self, other):
+        other_norm = self._norm_of(other)
+        if other_norm is None:
+            return NotImplemented
+        return self.norm() < other_norm
+
+    def __gt__(self, other):
+        other_norm = self._norm_of(other)
+        if other_norm is None:
+            return NotImplemented
+        return self.norm() > other_norm
+
+    def __le__(self, other):
+        other_norm = self._norm_of(other)
+        if other_norm is None:
+            return NotImplemented
+        return self.norm() <= other_norm
+
+    def __ge__(self, other):
+        other_norm = self._norm_of(other)
+        if other_norm is None:
+            return NotImplemented
+        return self.norm() >= other_norm
+
+
+class KDTree:
+    """
+    A static k-d tree over R2Vector/R3Vector points for nearest-neighbor and radius queries.
+
+    The tree is implicit: points are reordered so that the median of every
+    index range [lo, hi) sits at (lo + hi) // 2, split on axis depth % k, and
+    coordinates are kept in one array per axis in that order. Construction
+    sorts the indices once per axis and then partitions those sorted lists at
+    each level, which is O(n log n). Queries compare squared distances on the
+    raw coordinates, so no temporary vectors are created.
+    """
+
+    def __init__(self, points):
+        points = list(points)
+        self.axes = ('x', 'y', 'z') if points and hasattr(points[0], 'z') else ('x', 'y')
+        dimensions = len(self.axes)
+        coordinates = [array('d', (getattr(point, axis) for point in points)) for axis in self.axes]
+        order = array('q', [0]) * len(points)
+        side = bytearray(len(points))
+
+        def build(sorted_lists, start, depth):
+            count = len(sorted_lists[0])
+            if count == 0:
+                return
+            axis = depth % dimensions
+            by_axis = sorted_lists[axis]
+            middle = count // 2
+            order[start + middle] = by_axis[middle]
+            if count == 1:
+                return
+
+            for index in by_axis[:middle]:
+                side[index] = 1
+            for index in by_axis[middle:]:
+                side[index] = 0
+            side[by_axis[middle]] = 2
+            left = [by_axis[:middle] if other == axis else
+                    [index for index in sorted_list if side[index] == 1]
+                    for other, sorted_list in enumerate(sorted_lists)]
+            right = [by_axis[middle + 1:] if other == axis else
+                     [index for index in sorted_list if side[index] == 0]
+                     for other, sorted_list in enumerate(sorted_lists)]
+            build(left, start, depth + 1)
+            build(right, start + middle + 1, depth + 1)
+
+        build([sorted(range(len(points)), key=axis_values.__getitem__)
+               for axis_values in coordinates], 0, 0)
+        self.points = [points[index] for index in order]
+        self.coordinates = [array('d', (axis_values[index] for index in order))
+                            for axis_values in coordinates]
+
+    def __len__(self):
+        return len(self.points)
+
+    def nearest(self, point, k=1):
+        """Return the k points closest to point as (distance, vector) pairs, closest first."""
+        if k <= 0:
+            return []
+        target = [getattr(point, axis) for axis in self.axes]
+        coordinates = self.coordinates
+        dimensions = len(self.axes)
+        heap = []
+
+        def search(start, end, depth):
+            if start >= end:
+                return
+            middle = (start + end) // 2
+            distance = 0.0
+            for axis in range(dimensions):
+                difference = coordinates[axis][middle] - target[axis]
+                distance += difference * difference
+            if len(heap) < k:
+                heapq.heappush(heap, (-distance, middle))
+            elif distance < -heap[0][0]:
+                heapq.heapreplace(heap, (-distance, middle))
+
+            axis = depth % dimensions
+            difference = target[axis] - coordinates[axis][middle]
+            if difference < 0:
+                search(start, middle, depth + 1)
+                if len(heap) < k or difference * difference < -heap[0][0]:
+                    search(middle + 1, end, depth + 1)
+            else:
+                search(middle + 1, end, depth + 1)
+                if len(heap) < k or difference * difference < -heap[0][0]:
+                    search(start, middle, depth + 1)
+
+        search(0, len(self.points), 0)
+        return [((-distance)**0.5, self.points[index]) for distance, index in sorted(heap, reverse=True)]
+
+    def within(self, point, radius):
+        """Return the points at most radius from point as (distance, vector) pairs, closest first."""
+        target = [getattr(point, axis) for axis in self.axes]
+        coordinates = self.coordinates
+        dimensions = len(self.axes)
+        limit = radius * radius
+        found = []
+        stack = [(0, len(self.points), 0)]
+        while stack:
+            start, end, depth = stack.pop()
+            if start >= end:
+                continue
+            middle = (start + end) // 2
+            distance = 0.0
+            for axis in range(dimensions):
+                difference = coordinates[axis][middle] - target[axis]
+                distance += difference * difference
+            if distance <= limit:
+                found.append((distance, middle))
+
+            axis = depth % dimensions
+            difference = target[axis] - coordinates[axis][middle]
+            if difference <= 0 or difference * difference <= limit:
+                stack.append((start, middle, depth + 1))
+            if difference >= 0 or difference * difference <= limit:
+                stack.append((middle + 1, end, depth + 1))
+
+        found.sort()
+        return [(distance**0.5, self.points[index]) for distance, index in found]
+
+
+def benchmark_kdtree(num_points=10**6, num_queries=1000, k=10, radius=0.01):
+    """Print KDTree build time and per-query latency for random R3Vector points in the unit cube."""
+    points = [R3Vector(x=random.random(), y=random.random(), z=random.random())
+              for _ in range(num_points)]
+    queries = [R3Vector(x=random.random(), y=random.random(), z=random.random())
+               for _ in range(num_queries)]
+
+    start = time.perf_counter()
+    tree = KDTree(points)
+    print(f'build {num_points} points: {time.perf_counter() - start:.2f} s')
+
+    start = time.perf_counter()
+    for query in queries:
+        tree.nearest(query, k)
+    print(f'{k}-NN: {(time.perf_counter() - start) / num_queries * 1e6:.1f} us/query')
+
+    start = time.perf_counter()
+    for query in queries:
+        tree.within(query, radius)
+    print(f'radius {radius}: {(time.perf_counter() - start) / num_queries * 1e6:.1f} us/query')
+
+    scan_queries = queries[:max(num_queries // 100, 1)]
+    start = time.perf_counter()
+    for query in scan_queries:
+        min(points, key=lambda point: (point - query).norm())
+    print(f'linear scan 1-NN: {(time.perf_counter() - start) / len(scan_queries) * 1e6:.1f} us/query')
+
+
 v1 = R3Vector(x=2, y=3, z=1)
 v2 = R3Vector(x=0.5, y=1.25, z=2)
 print(f'v1 = {v1}')